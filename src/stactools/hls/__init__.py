@@ -1,9 +1,24 @@
 import stactools.core
 from stactools.cli.registry import Registry
 
-from stactools.hls.stac import create_collection, create_item
-
-__all__ = ["create_item", "create_collection"]
+from stactools.hls.aio import create_item_async, create_items_async
+from stactools.hls.metadata import GranuleRecord
+from stactools.hls.stac import (
+    create_collection,
+    create_granule_record,
+    create_item,
+    create_item_from_record,
+)
+
+__all__ = [
+    "create_item",
+    "create_collection",
+    "create_granule_record",
+    "create_item_from_record",
+    "create_item_async",
+    "create_items_async",
+    "GranuleRecord",
+]
 
 stactools.core.use_fsspec()
 
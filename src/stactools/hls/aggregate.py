@@ -0,0 +1,216 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from pystac import (
+    Collection,
+    Item,
+    RangeSummary,
+    SpatialExtent,
+    Summaries,
+    TemporalExtent,
+)
+from pystac.utils import datetime_to_str
+
+from stactools.hls import utils
+
+RANGE_PROPERTIES = ["eo:cloud_cover", "view:azimuth", "view:sun_azimuth"]
+
+
+class ItemAggregator:
+    """Incrementally aggregates the extent and summaries of a stream of HLS
+    Items.
+
+    Only running minimums, maximums, small sets, and counts are kept, so memory
+    use does not grow with the number of Items. Aggregators for separate shards
+    of a collection can be combined with `merge`.
+    """
+
+    def __init__(self) -> None:
+        self.bbox: Optional[List[float]] = None
+        self.start_datetime: Optional[datetime] = None
+        self.end_datetime: Optional[datetime] = None
+        self.ranges: Dict[str, List[float]] = {}
+        self.platforms: Set[str] = set()
+        self.utm_zones: Set[int] = set()
+        self.product_counts: Dict[str, int] = {}
+
+    @property
+    def count(self) -> int:
+        """Number of Items aggregated."""
+        return sum(self.product_counts.values())
+
+    def add_item(self, item: Item, count: bool = True) -> None:
+        """Updates the aggregate with a single Item.
+
+        Args:
+            item (Item): An HLS STAC Item.
+            count (bool): Flag to count the Item in the per-product Item
+                counts. Set to False when the Item replaces an Item that is
+                already counted. Defaults to True.
+        """
+        if item.bbox is not None:
+            self._update_bbox(item.bbox)
+
+        start = item.common_metadata.start_datetime or item.datetime
+        end = item.common_metadata.end_datetime or item.datetime
+        if start is not None and end is not None:
+            self._update_interval(start, end)
+
+        for key in RANGE_PROPERTIES:
+            value = item.properties.get(key)
+            if value is not None:
+                self._update_range(key, value, value)
+
+        platform = item.common_metadata.platform
+        if platform:
+            self.platforms.update(p.strip() for p in platform.split(","))
+        utm_zone = item.properties.get("mgrs:utm_zone")
+        if utm_zone is not None:
+            self.utm_zones.add(utm_zone)
+        product = item.properties["hls:product"]
+        self.product_counts[product] = self.product_counts.get(product, 0) + int(count)
+
+    def merge(self, other: "ItemAggregator") -> "ItemAggregator":
+        """Combines another aggregate into this one.
+
+        Args:
+            other (ItemAggregator): Aggregate of another set of Items, e.g.,
+                from a separate shard.
+
+        Returns:
+            ItemAggregator: This aggregate, updated in place.
+        """
+        if other.bbox is not None:
+            self._update_bbox(other.bbox)
+        if other.start_datetime is not None and other.end_datetime is not None:
+            self._update_interval(other.start_datetime, other.end_datetime)
+        for key, (minimum, maximum) in other.ranges.items():
+            self._update_range(key, minimum, maximum)
+        self.platforms.update(other.platforms)
+        self.utm_zones.update(other.utm_zones)
+        for product, count in other.product_counts.items():
+            self.product_counts[product] = self.product_counts.get(product, 0) + count
+        return self
+
+    def update_collection(self, collection: Collection) -> None:
+        """Sets the Collection extent and data-derived summaries from the
+        aggregate.
+
+        Static summaries, e.g., `eo:bands`, are left unchanged. Per-product Item
+        counts are stored in the `hls:item_counts` field.
+
+        Args:
+            collection (Collection): The Collection to update.
+        """
+        if self.bbox is not None:
+            collection.extent.spatial = SpatialExtent([self.bbox])
+        if self.start_datetime is not None:
+            collection.extent.temporal = TemporalExtent(
+                [[self.start_datetime, self.end_datetime]]
+            )
+
+        summaries = collection.summaries
+        if summaries is None:
+            summaries = collection.summaries = Summaries({})
+        if self.platforms:
+            summaries.add("platform", sorted(self.platforms))
+        if self.utm_zones:
+            summaries.add("mgrs:utm_zone", sorted(self.utm_zones))
+        if self.product_counts:
+            summaries.add("hls:product", sorted(self.product_counts))
+        for key, (minimum, maximum) in sorted(self.ranges.items()):
+            summaries.add(key, RangeSummary(minimum, maximum))
+
+        collection.extra_fields["hls:item_counts"] = dict(
+            sorted(self.product_counts.items())
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a JSON-serializable dictionary of the aggregate."""
+        return {
+            "bbox": self.bbox,
+            "interval": [
+                datetime_to_str(self.start_datetime) if self.start_datetime else None,
+                datetime_to_str(self.end_datetime) if self.end_datetime else None,
+            ],
+            "ranges": self.ranges,
+            "platforms": sorted(self.platforms),
+            "utm_zones": sorted(self.utm_zones),
+            "product_counts": self.product_counts,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ItemAggregator":
+        """Creates an aggregate from a dictionary created by `to_dict`."""
+        aggregator = cls()
+        aggregator.bbox = d["bbox"]
+        start, end = d["interval"]
+        if start is not None and end is not None:
+            aggregator.start_datetime = utils.parse_hls_datetime(start)
+            aggregator.end_datetime = utils.parse_hls_datetime(end)
+        aggregator.ranges = {key: list(value) for key, value in d["ranges"].items()}
+        aggregator.platforms = set(d["platforms"])
+        aggregator.utm_zones = set(d["utm_zones"])
+        aggregator.product_counts = dict(d["product_counts"])
+        return aggregator
+
+    @classmethod
+    def from_collection(cls, collection: Collection) -> "ItemAggregator":
+        """Creates an aggregate from the extent, summaries, and Item counts of
+        an existing Collection, e.g., to add Items to it without reading its
+        existing Items.
+
+        Extents and ranges only grow, so replacing an Item never shrinks them.
+        Item counts are only restored if the Collection has the
+        `hls:item_counts` field.
+
+        Args:
+            collection (Collection): A Collection whose extent and summaries
+                were set by `update_collection`.
+
+        Returns:
+            ItemAggregator: The aggregate.
+        """
+        aggregator = cls()
+        bboxes = collection.extent.spatial.bboxes
+        if bboxes:
+            aggregator.bbox = list(bboxes[0][:4])
+        intervals = collection.extent.temporal.intervals
+        if intervals:
+            aggregator.start_datetime, aggregator.end_datetime = intervals[0]
+
+        summaries = collection.summaries
+        for key in RANGE_PROPERTIES:
+            summary = summaries.get_range(key)
+            if summary is not None:
+                aggregator.ranges[key] = [summary.minimum, summary.maximum]
+        aggregator.platforms = set(summaries.get_list("platform") or [])
+        aggregator.utm_zones = set(summaries.get_list("mgrs:utm_zone") or [])
+        aggregator.product_counts = dict(
+            collection.extra_fields.get("hls:item_counts", {})
+        )
+        return aggregator
+
+    def _update_bbox(self, bbox: List[float]) -> None:
+        if self.bbox is None:
+            self.bbox = list(bbox[:4])
+        else:
+            self.bbox = [
+                min(self.bbox[0], bbox[0]),
+                min(self.bbox[1], bbox[1]),
+                max(self.bbox[2], bbox[2]),
+                max(self.bbox[3], bbox[3]),
+            ]
+
+    def _update_interval(self, start: datetime, end: datetime) -> None:
+        if self.start_datetime is None or start < self.start_datetime:
+            self.start_datetime = start
+        if self.end_datetime is None or end > self.end_datetime:
+            self.end_datetime = end
+
+    def _update_range(self, key: str, minimum: float, maximum: float) -> None:
+        if key in self.ranges:
+            current = self.ranges[key]
+            self.ranges[key] = [min(current[0], minimum), max(current[1], maximum)]
+        else:
+            self.ranges[key] = [minimum, maximum]
@@ -0,0 +1,310 @@
+import asyncio
+from contextlib import AsyncExitStack
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+import fsspec
+from fsspec.core import split_protocol, url_to_fs
+from pystac import Item
+from stactools.core.io import ReadHrefModifier
+from stactools.core.utils.antimeridian import Strategy
+
+from stactools.hls import utils
+from stactools.hls.metadata import Metadata, check_cog_href, read_cog_header
+from stactools.hls.stac import create_item_from_record
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 32
+
+
+class AsyncReader:
+    """Bounded, concurrent reads of granule files from an asyncio event loop.
+
+    Files on filesystems with an async fsspec implementation (e.g., http or
+    s3) are read natively; the filesystems, and their connection pools, are
+    reused for the lifetime of the reader. Other reads, including COG headers
+    read with rasterio, run in the event loop's default thread pool. At most
+    `max_concurrency` reads are in flight at once.
+
+    Use as an async context manager, or call `close` when done.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self._filesystems: Dict[str, fsspec.AbstractFileSystem] = {}
+        self._exit_stack = AsyncExitStack()
+
+    async def __aenter__(self) -> "AsyncReader":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    async def read_bytes(self, href: str) -> bytes:
+        """Reads a file.
+
+        Args:
+            href (str): HREF to the file, already modified for reading if
+                needed.
+
+        Returns:
+            bytes: The file contents.
+        """
+        async with self.semaphore:
+            fs, path = self._filesystem(href)
+            data: bytes
+            if fs.async_impl:
+                data = await fs._cat_file(path)
+            else:
+                data = await self._in_thread(fs.cat_file, path)
+            return data
+
+    async def exists(self, href: str) -> bool:
+        """Checks that a file exists.
+
+        Args:
+            href (str): HREF to the file, already modified for reading if
+                needed.
+
+        Returns:
+            bool: True if the file exists.
+        """
+        async with self.semaphore:
+            fs, path = self._filesystem(href)
+            if fs.async_impl:
+                return bool(await fs._exists(path))
+            return bool(await self._in_thread(fs.exists, path))
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Runs a blocking read, e.g., with rasterio, in a thread.
+
+        Args:
+            func (Callable[..., T]): The blocking function.
+            *args: Positional arguments for `func`.
+            **kwargs: Keyword arguments for `func`.
+
+        Returns:
+            T: The result of `func`.
+        """
+        async with self.semaphore:
+            return await self._in_thread(partial(func, *args, **kwargs))
+
+    async def close(self) -> None:
+        """Closes the clients of every async filesystem the reader created, in
+        reverse order of creation, even if closing one of them fails.
+
+        Filesystems without an async implementation come from the shared
+        fsspec instance cache and are left open.
+        """
+        self._filesystems.clear()
+        await self._exit_stack.aclose()
+
+    def _filesystem(self, href: str) -> Tuple[fsspec.AbstractFileSystem, str]:
+        protocol = split_protocol(href)[0] or "file"
+        cls = fsspec.get_filesystem_class(protocol)
+        if not cls.async_impl:
+            fs, path = url_to_fs(href)
+            return fs, path
+        if protocol not in self._filesystems:
+            fs = fsspec.filesystem(
+                protocol, asynchronous=True, skip_instance_cache=True
+            )
+            self._exit_stack.push_async_callback(_close_filesystem, fs)
+            self._filesystems[protocol] = fs
+        return self._filesystems[protocol], cls._strip_protocol(href)
+
+    async def _in_thread(self, func: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+async def _close_filesystem(fs: fsspec.AbstractFileSystem) -> None:
+    # Async filesystems create their clients lazily: an aiohttp session for
+    # http and gcs, and an aiobotocore client context for s3
+    s3creator = getattr(fs, "_s3creator", None)
+    if s3creator is not None:
+        await s3creator.__aexit__(None, None, None)
+    session = getattr(fs, "_session", None)
+    if session is not None and not getattr(session, "closed", False):
+        await session.close()
+
+
+async def load_metadata_async(
+    cog_href: str,
+    reader: AsyncReader,
+    read_href_modifier: Optional[ReadHrefModifier] = None,
+    read_xml: bool = True,
+) -> Metadata:
+    """Reads the COG header and CMR XML metadata file of an HLS granule
+    concurrently.
+
+    Args:
+        cog_href (str): HREF to one of the EO COG files in the granule.
+        reader (AsyncReader): Reader for the granule files.
+        read_href_modifier (ReadHrefModifier, optional): An optional
+            function to modify the href (e.g. to add a token to a url)
+        read_xml (bool): Flag to read the CMR XML metadata file, which is only
+            needed for the XML geometry. Defaults to True.
+
+    Returns:
+        Metadata: The granule metadata.
+    """
+    check_cog_href(cog_href)
+    header_read = reader.run(
+        read_cog_header, utils.modify_href(cog_href, read_href_modifier)
+    )
+    cmr_xml: Optional[bytes] = None
+    if read_xml:
+        xml_href = utils.modify_href(utils.cmr_xml_href(cog_href), read_href_modifier)
+        header, cmr_xml = await asyncio.gather(header_read, reader.read_bytes(xml_href))
+    else:
+        header = await header_read
+    return Metadata(
+        cog_href,
+        read_href_modifier,
+        header=header,
+        cmr_xml=cmr_xml,
+    )
+
+
+async def check_existence_async(
+    cog_href: str,
+    reader: AsyncReader,
+    read_href_modifier: Optional[ReadHrefModifier] = None,
+) -> None:
+    """Checks that COGs exist for all granule assets, concurrently.
+
+    Args:
+        cog_href (str): HREF to one of the COG files in the granule.
+        reader (AsyncReader): Reader for the granule files.
+        read_href_modifier (ReadHrefModifier, optional): An optional
+            function to modify the href (e.g. to add a token to a url)
+
+    Raises:
+        ValueError: If a COG does not exist.
+    """
+    product = utils.product_from_href(cog_href)
+    cog_hrefs = utils.create_cog_hrefs(cog_href, product, False)
+    exists = await asyncio.gather(
+        *[
+            reader.exists(utils.modify_href(href, read_href_modifier))
+            for href in cog_hrefs
+        ]
+    )
+    for href, href_exists in zip(cog_hrefs, exists):
+        if not href_exists:
+            raise ValueError(f"File not found: {href}")
+
+
+async def create_item_async(
+    cog_href: str,
+    read_href_modifier: Optional[ReadHrefModifier] = None,
+    use_raster_footprint: bool = False,
+    check_existence: bool = False,
+    antimeridian_strategy: Strategy = Strategy.SPLIT,
+    fmask_statistics: bool = False,
+    raster_statistics: bool = False,
+    raster_histograms: bool = False,
+    reader: Optional[AsyncReader] = None,
+) -> Item:
+    """Creates a STAC Item for an HLS granule without blocking the event loop.
+
+    The COG header, the CMR XML metadata file, and the COG existence checks
+    are read concurrently, so the latency is roughly that of the slowest read
+    rather than the sum of all reads. The Item is assembled by the same code
+    as `stac.create_item`.
+
+    Args:
+        cog_href (str): HREF to one of the EO COG files in the granule.
+        read_href_modifier (ReadHrefModifier, optional): An optional
+            function to modify the href (e.g. to add a token to a url)
+        use_raster_footprint (bool): Flag to use stactools raster_footprint
+            for the Item geometry rather than the boundary in the XML metadata
+            file.
+        check_existence (bool, optional): Flag to check that COGs exist for all
+                granule assets. Defaults to False.
+        antimeridian_strategy (Strategy, optional):Choice of 'normalize' or
+            'split' to either split the Item geometry on -180 longitude or
+            normalize the Item geometry so all longitudes are either positive or
+            negative. Default is 'split'.
+        fmask_statistics (bool, optional): Flag to add Fmask statistics.
+            Defaults to False.
+        raster_statistics (bool, optional): Flag to add `raster:bands`
+            statistics. Defaults to False.
+        raster_histograms (bool, optional): Flag to also add `raster:bands`
+            histograms. Defaults to False.
+        reader (AsyncReader, optional): Reader shared between granules, which
+            bounds the number of concurrent reads. If not set, a reader is
+            created and closed for this granule.
+
+    Returns:
+        Item: An HLS STAC Item.
+    """
+    if reader is None:
+        async with AsyncReader() as granule_reader:
+            return await create_item_async(
+                cog_href,
+                read_href_modifier,
+                use_raster_footprint,
+                check_existence,
+                antimeridian_strategy,
+                fmask_statistics,
+                raster_statistics,
+                raster_histograms,
+                reader=granule_reader,
+            )
+
+    metadata_read = load_metadata_async(
+        cog_href, reader, read_href_modifier, read_xml=not use_raster_footprint
+    )
+    if check_existence:
+        metadata, _ = await asyncio.gather(
+            metadata_read,
+            check_existence_async(cog_href, reader, read_href_modifier),
+        )
+    else:
+        metadata = await metadata_read
+
+    to_record = partial(
+        metadata.to_record,
+        use_raster_footprint,
+        fmask_statistics,
+        raster_statistics,
+        raster_histograms,
+    )
+    if any(
+        [use_raster_footprint, fmask_statistics, raster_statistics, raster_histograms]
+    ):
+        # Raster features read pixels
+        record = await reader.run(to_record)
+    else:
+        record = to_record()
+    return create_item_from_record(record, antimeridian_strategy=antimeridian_strategy)
+
+
+async def create_items_async(
+    cog_hrefs: Iterable[str],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    **item_options: Any,
+) -> List[Item]:
+    """Creates STAC Items for many HLS granules concurrently.
+
+    Args:
+        cog_hrefs (Iterable[str]): HREFs to a single EO COG file for each
+            granule.
+        max_concurrency (int): Maximum number of reads in flight across all
+            granules.
+        **item_options: Keyword arguments for `create_item_async`, e.g.,
+            `check_existence=True`.
+
+    Returns:
+        List[Item]: The Items, in the order of `cog_hrefs`.
+    """
+    async with AsyncReader(max_concurrency) as reader:
+        items: List[Item] = await asyncio.gather(
+            *[
+                create_item_async(href, reader=reader, **item_options)
+                for href in cog_hrefs
+            ]
+        )
+    return items
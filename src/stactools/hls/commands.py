@@ -1,5 +1,7 @@
 import logging
 import os
+import signal
+from typing import Any, Callable, List, Optional, TypeVar
 
 import click
 from click import Command, Group
@@ -7,10 +9,56 @@ from pystac import CatalogType
 from pystac.utils import make_absolute_href
 from stactools.core.utils.antimeridian import Strategy
 
-from stactools.hls import stac
+from stactools.hls import (
+    index,
+    inventory,
+    layout,
+    reconcile,
+    shard,
+    stac,
+    update,
+    worker,
+    writer,
+)
+from stactools.hls.aggregate import ItemAggregator
 
 logger = logging.getLogger(__name__)
 
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Options shared by every command that creates Items
+_STATISTICS_OPTIONS = [
+    click.option(
+        "-f",
+        "--fmask-statistics",
+        is_flag=True,
+        default=False,
+        help="Add cloud, shadow, snow/ice, water, and valid data percentages "
+        "computed from an overview of the Fmask COG",
+    ),
+    click.option(
+        "-r",
+        "--raster-statistics",
+        is_flag=True,
+        default=False,
+        help="Add raster:bands statistics computed from overviews of every "
+        "asset COG",
+    ),
+    click.option(
+        "--raster-histograms",
+        is_flag=True,
+        default=False,
+        help="Add raster:bands statistics and histograms",
+    ),
+]
+
+
+def _statistics_options(command: F) -> F:
+    """Adds the `_STATISTICS_OPTIONS` to a command."""
+    for option in reversed(_STATISTICS_OPTIONS):
+        command = option(command)
+    return command
+
 
 def create_hls_command(cli: Group) -> Command:
     """Creates the stactools-hls command line utility."""
@@ -32,6 +80,7 @@ def create_hls_command(cli: Group) -> Command:
         default=False,
         help="Use valid data pixels for Item geometry rather than XML metadata",
     )
+    @_statistics_options
     @click.option(
         "-c",
         "--check-existence",
@@ -51,6 +100,9 @@ def create_hls_command(cli: Group) -> Command:
         source: str,
         outdir: str,
         use_raster_footprint: bool,
+        fmask_statistics: bool,
+        raster_statistics: bool,
+        raster_histograms: bool,
         check_existence: bool,
         antimeridian_strategy: str,
     ) -> None:
@@ -63,6 +115,9 @@ def create_hls_command(cli: Group) -> Command:
             use_raster_footprint (bool): Flag to use stactools raster_footprint
                 for the Item geometry rather than the boundary in the XML
                 metadata file.
+            fmask_statistics, raster_statistics, raster_histograms (bool):
+                Flags to add Fmask and `raster:bands` statistics, as described
+                in the option help. Default is False.
             check_existence (bool): Flag to check that COGs exist for all
                 granule assets. Default is False.
             antimeridian_strategy (str, optional): Choice of 'normalize' or
@@ -75,6 +130,9 @@ def create_hls_command(cli: Group) -> Command:
         item = stac.create_item(
             source,
             use_raster_footprint=use_raster_footprint,
+            fmask_statistics=fmask_statistics,
+            raster_statistics=raster_statistics,
+            raster_histograms=raster_histograms,
             check_existence=check_existence,
             antimeridian_strategy=strategy,
         )
@@ -96,6 +154,7 @@ def create_hls_command(cli: Group) -> Command:
         default=False,
         help="Use valid data pixels for Item geometry rather than XML metadata",
     )
+    @_statistics_options
     @click.option(
         "-c",
         "--check-existence",
@@ -111,12 +170,34 @@ def create_hls_command(cli: Group) -> Command:
         show_default=True,
         help="Geometry strategy for antimeridian scenes",
     )
+    @click.option(
+        "-l",
+        "--layout",
+        "layout_name",
+        type=click.Choice(layout.LAYOUTS, case_sensitive=False),
+        default="flat",
+        show_default=True,
+        help="Add Items directly to the Collection or to child Collections "
+        "by MGRS zone and latitude band, year, and month",
+    )
+    @click.option(
+        "--reconcile",
+        "reconcile_policy",
+        type=click.Choice(reconcile.POLICIES, case_sensitive=False),
+        help="Keep only the latest or earliest version of granules with the "
+        "same product, tile, and sensing time",
+    )
     def create_collection_command(
         infile: str,
         outdir: str,
         use_raster_footprint: bool,
+        fmask_statistics: bool,
+        raster_statistics: bool,
+        raster_histograms: bool,
         check_existence: bool,
         antimeridian_strategy: str,
+        layout_name: str,
+        reconcile_policy: Optional[str],
     ) -> None:
         """Creates a STAC Collection with Items created from granule asset HREFs
         listed in INFILE. Only one asset HREF for each granule should be listed.
@@ -130,36 +211,674 @@ def create_hls_command(cli: Group) -> Command:
             use_raster_footprint (bool): Flag to use stactools raster_footprint
                 for the Item geometry rather than the boundary in the XML
                 metadata file.
+            fmask_statistics, raster_statistics, raster_histograms (bool):
+                Flags to add Fmask and `raster:bands` statistics, as described
+                in the option help. Default is False.
             check_existence (bool): Flag to check that COGs exist for all
                 granule assets for each Item. Default is False.
             antimeridian_strategy (str, optional): Choice of 'normalize' or
                 'split' to either split the Item geometry on -180 longitude or
                 normalize the Item geometry so all longitudes are either
                 positive or negative. Default is 'split'.
+            layout_name (str): Choice of 'flat' to add Items directly to the
+                Collection or 'tile-time' to add Items to child Collections by
+                MGRS zone and latitude band, year, and month. Default is
+                'flat'.
+            reconcile_policy (str, optional): Choice of 'latest' or
+                'earliest' to keep only one version of granules with the same
+                product, tile, and sensing time, using the file names only.
+                All granules are used if not set.
         """
         strategy = Strategy[antimeridian_strategy.upper()]
 
-        with open(infile) as f:
-            hrefs = [make_absolute_href(line.strip()) for line in f.readlines()]
+        hrefs = _read_hrefs(infile, reconcile_policy)
 
         collection = stac.create_collection()
         collection.set_self_href(os.path.join(outdir, "collection.json"))
 
+        item_layout = layout.get_layout(layout_name.lower(), collection)
+        aggregator = ItemAggregator()
         for href in hrefs:
             item = stac.create_item(
                 href,
                 use_raster_footprint=use_raster_footprint,
+                fmask_statistics=fmask_statistics,
+                raster_statistics=raster_statistics,
+                raster_histograms=raster_histograms,
                 check_existence=check_existence,
                 antimeridian_strategy=strategy,
             )
-            collection.add_item(item)
-        collection.update_extent_from_items()
+            aggregator.add_item(item)
+            item_layout.add_item(item)
+        aggregator.update_collection(collection)
+        item_layout.finalize()
 
         collection.catalog_type = CatalogType.SELF_CONTAINED
         collection.make_all_asset_hrefs_relative()
         collection.validate_all()
-        collection.save()
+        writer.save_catalog(collection)
+
+        return None
+
+    @hls.command(
+        "update-collection",
+        short_help="Add new and changed Items to an existing STAC Collection",
+    )
+    @click.argument("INFILE")
+    @click.argument("OUTDIR")
+    @click.option(
+        "-u",
+        "--use-raster-footprint",
+        is_flag=True,
+        default=False,
+        help="Use valid data pixels for Item geometry rather than XML metadata",
+    )
+    @_statistics_options
+    @click.option(
+        "-c",
+        "--check-existence",
+        is_flag=True,
+        default=False,
+        help="Check that all granule asset COGs exist",
+    )
+    @click.option(
+        "-a",
+        "--antimeridian-strategy",
+        type=click.Choice(["normalize", "split"], case_sensitive=False),
+        default="split",
+        show_default=True,
+        help="Geometry strategy for antimeridian scenes",
+    )
+    @click.option(
+        "-l",
+        "--layout",
+        "layout_name",
+        type=click.Choice(layout.LAYOUTS, case_sensitive=False),
+        default="flat",
+        show_default=True,
+        help="The layout used to create the Collection",
+    )
+    @click.option(
+        "-v",
+        "--validate",
+        is_flag=True,
+        default=False,
+        help="Validate the Collection (requires network access)",
+    )
+    def update_collection_command(
+        infile: str,
+        outdir: str,
+        use_raster_footprint: bool,
+        fmask_statistics: bool,
+        raster_statistics: bool,
+        raster_histograms: bool,
+        check_existence: bool,
+        antimeridian_strategy: str,
+        layout_name: str,
+        validate: bool,
+    ) -> None:
+        """Adds Items created from the granule asset HREFs listed in INFILE to
+        the self-contained STAC Collection in OUTDIR. Items for granules
+        already in the Collection are replaced only if they changed. Only the
+        Items and Collections that changed are written.
+
+        \b
+        Args:
+            infile (str): Text file containing one HREF per line. The HREFs
+                should point to a single HLS or L30 granule COG file. Do not
+                list multiple COG file HREFs for the same granule.
+            outdir (str): Directory containing the collection.
+            use_raster_footprint (bool): Flag to use stactools raster_footprint
+                for the Item geometry rather than the boundary in the XML
+                metadata file.
+            fmask_statistics, raster_statistics, raster_histograms (bool):
+                Flags to add Fmask and `raster:bands` statistics, as described
+                in the option help. Default is False.
+            check_existence (bool): Flag to check that COGs exist for all
+                granule assets for each Item. Default is False.
+            antimeridian_strategy (str, optional): Choice of 'normalize' or
+                'split' to either split the Item geometry on -180 longitude or
+                normalize the Item geometry so all longitudes are either
+                positive or negative. Default is 'split'.
+            layout_name (str): Choice of 'flat' or 'tile-time'. Must match the
+                layout used to create the Collection. Default is 'flat'.
+            validate (bool): Flag to validate the Collection. Fetching the JSON
+                schemas requires network access. Default is False.
+        """
+        strategy = Strategy[antimeridian_strategy.upper()]
+
+        hrefs = _read_hrefs(infile)
+
+        result = update.update_collection(
+            os.path.join(outdir, "collection.json"),
+            hrefs,
+            layout_name=layout_name.lower(),
+            use_raster_footprint=use_raster_footprint,
+            fmask_statistics=fmask_statistics,
+            raster_statistics=raster_statistics,
+            raster_histograms=raster_histograms,
+            check_existence=check_existence,
+            antimeridian_strategy=strategy,
+        )
+        if validate:
+            result.collection.validate()
+
+        return None
+
+    @hls.command(
+        "create-collection-shard",
+        short_help="Create the Items for one shard of a STAC Collection",
+    )
+    @click.argument("INFILE")
+    @click.argument("OUTDIR")
+    @click.option(
+        "-s",
+        "--shard",
+        "shard_index",
+        type=int,
+        required=True,
+        help="Zero-based index of the shard to create",
+    )
+    @click.option(
+        "-n",
+        "--num-shards",
+        type=int,
+        required=True,
+        help="Total number of shards",
+    )
+    @click.option(
+        "-b",
+        "--shard-by",
+        type=click.Choice(shard.SHARD_BY, case_sensitive=False),
+        default="hash",
+        show_default=True,
+        help="Split granules by a hash of the granule id or by MGRS UTM zone",
+    )
+    @click.option(
+        "-u",
+        "--use-raster-footprint",
+        is_flag=True,
+        default=False,
+        help="Use valid data pixels for Item geometry rather than XML metadata",
+    )
+    @_statistics_options
+    @click.option(
+        "-c",
+        "--check-existence",
+        is_flag=True,
+        default=False,
+        help="Check that all granule asset COGs exist",
+    )
+    @click.option(
+        "-a",
+        "--antimeridian-strategy",
+        type=click.Choice(["normalize", "split"], case_sensitive=False),
+        default="split",
+        show_default=True,
+        help="Geometry strategy for antimeridian scenes",
+    )
+    @click.option(
+        "--reconcile",
+        "reconcile_policy",
+        type=click.Choice(reconcile.POLICIES, case_sensitive=False),
+        help="Keep only the latest or earliest version of granules with the "
+        "same product, tile, and sensing time",
+    )
+    def create_collection_shard_command(
+        infile: str,
+        outdir: str,
+        shard_index: int,
+        num_shards: int,
+        shard_by: str,
+        use_raster_footprint: bool,
+        fmask_statistics: bool,
+        raster_statistics: bool,
+        raster_histograms: bool,
+        check_existence: bool,
+        antimeridian_strategy: str,
+        reconcile_policy: Optional[str],
+    ) -> None:
+        """Creates the STAC Items for one shard of the granule asset HREFs
+        listed in INFILE. Every shard run must use the same INFILE, OUTDIR, and
+        shard options. Run merge-collection once all shards are complete.
+
+        \b
+        Args:
+            infile (str): Text file containing one HREF per line. The HREFs
+                should point to a single HLS or L30 granule COG file. Do not
+                list multiple COG file HREFs for the same granule.
+            outdir (str): Directory that will contain the collection.
+            shard_index (int): Zero-based index of the shard to create.
+            num_shards (int): Total number of shards.
+            shard_by (str): Choice of 'hash' to split granules evenly by a
+                hash of the granule id or 'zone' to keep granules in the same
+                MGRS UTM zone together. Default is 'hash'.
+            use_raster_footprint (bool): Flag to use stactools raster_footprint
+                for the Item geometry rather than the boundary in the XML
+                metadata file.
+            fmask_statistics, raster_statistics, raster_histograms (bool):
+                Flags to add Fmask and `raster:bands` statistics, as described
+                in the option help. Default is False.
+            check_existence (bool): Flag to check that COGs exist for all
+                granule assets for each Item. Default is False.
+            antimeridian_strategy (str, optional): Choice of 'normalize' or
+                'split' to either split the Item geometry on -180 longitude or
+                normalize the Item geometry so all longitudes are either
+                positive or negative. Default is 'split'.
+            reconcile_policy (str, optional): Choice of 'latest' or
+                'earliest' to keep only one version of granules with the same
+                product, tile, and sensing time, using the file names only.
+                All granules are used if not set.
+        """
+        strategy = Strategy[antimeridian_strategy.upper()]
+
+        hrefs = _read_hrefs(infile, reconcile_policy)
+
+        partial_href = shard.create_shard(
+            hrefs,
+            outdir,
+            shard_index,
+            num_shards,
+            shard_by=shard_by.lower(),
+            use_raster_footprint=use_raster_footprint,
+            fmask_statistics=fmask_statistics,
+            raster_statistics=raster_statistics,
+            raster_histograms=raster_histograms,
+            check_existence=check_existence,
+            antimeridian_strategy=strategy,
+        )
+        logger.info(f"Saved shard {shard_index} of {num_shards} to {partial_href}")
+
+        return None
+
+    @hls.command(
+        "merge-collection",
+        short_help="Create a STAC Collection from sharded Items",
+    )
+    @click.argument("OUTDIR")
+    @click.option(
+        "-k",
+        "--keep-partials",
+        is_flag=True,
+        default=False,
+        help="Keep the shard partial files after merging",
+    )
+    @click.option(
+        "-v",
+        "--validate",
+        is_flag=True,
+        default=False,
+        help="Validate the Collection (requires network access)",
+    )
+    def merge_collection_command(
+        outdir: str, keep_partials: bool, validate: bool
+    ) -> None:
+        """Creates a STAC Collection in OUTDIR from the Items and partial
+        extent and summary files saved by create-collection-shard. Items are
+        not read.
+
+        \b
+        Args:
+            outdir (str): Directory containing the shard Items and partial
+                files.
+            keep_partials (bool): Flag to keep the shard partial files.
+                Default is False.
+            validate (bool): Flag to validate the Collection. Fetching the JSON
+                schemas requires network access. Default is False.
+        """
+        collection = shard.merge_shards(outdir, remove_partials=not keep_partials)
+        if validate:
+            collection.validate()
+
+        return None
+
+    @hls.command("harvest", short_help="Harvest granule metadata into a local index")
+    @click.argument("INFILE")
+    @click.argument("index_path", metavar="INDEX")
+    @click.option(
+        "-u",
+        "--use-raster-footprint",
+        is_flag=True,
+        default=False,
+        help="Use valid data pixels for Item geometry rather than XML metadata",
+    )
+    @_statistics_options
+    @click.option(
+        "-w",
+        "--max-workers",
+        type=int,
+        default=1,
+        show_default=True,
+        help="Number of threads used to read granule metadata",
+    )
+    @click.option(
+        "--reconcile",
+        "reconcile_policy",
+        type=click.Choice(reconcile.POLICIES, case_sensitive=False),
+        help="Keep only the latest or earliest version of granules with the "
+        "same product, tile, and sensing time",
+    )
+    @click.option(
+        "-s",
+        "--skip-existing",
+        is_flag=True,
+        default=False,
+        help="Skip granules already in the index, e.g., to resume a harvest",
+    )
+    def harvest_command(
+        infile: str,
+        index_path: str,
+        use_raster_footprint: bool,
+        fmask_statistics: bool,
+        raster_statistics: bool,
+        raster_histograms: bool,
+        max_workers: int,
+        reconcile_policy: Optional[str],
+        skip_existing: bool,
+    ) -> None:
+        """Reads the metadata for the granule asset HREFs listed in INFILE into
+        a local SQLite INDEX. Only one asset HREF for each granule should be
+        listed. The index is committed in batches, and granules that cannot be
+        read are logged and skipped.
+
+        \b
+        Args:
+            infile (str): Text file containing one HREF per line. The HREFs
+                should point to a single HLS or L30 granule COG file. Do not
+                list multiple COG file HREFs for the same granule.
+            index_path (str): SQLite index file. Created if it does not exist.
+            use_raster_footprint (bool): Flag to use stactools raster_footprint
+                for the Item geometry rather than the boundary in the XML
+                metadata file.
+            fmask_statistics, raster_statistics, raster_histograms (bool):
+                Flags to add Fmask and `raster:bands` statistics, as described
+                in the option help. Default is False.
+            max_workers (int): Number of threads used to read granule metadata.
+            reconcile_policy (str, optional): Choice of 'latest' or
+                'earliest' to keep only one version of granules with the same
+                product, tile, and sensing time, using the file names only.
+                All granules are used if not set.
+            skip_existing (bool): Flag to skip granules whose id is already in
+                the index without reading them, e.g., to resume an
+                interrupted harvest. Default is False.
+        """
+        hrefs = _read_hrefs(infile, reconcile_policy)
+
+        result = index.harvest(
+            hrefs,
+            index_path,
+            use_raster_footprint=use_raster_footprint,
+            fmask_statistics=fmask_statistics,
+            raster_statistics=raster_statistics,
+            raster_histograms=raster_histograms,
+            max_workers=max_workers,
+            skip_existing=skip_existing,
+        )
+        logger.info(
+            f"Harvested {result.harvested} granules into {index_path}; skipped "
+            f"{len(result.skipped)} already indexed"
+        )
+        if result.failed:
+            logger.warning(f"Failed to harvest {len(result.failed)} granules")
+
+        return None
+
+    @hls.command(
+        "create-collection-from-index",
+        short_help="Create a STAC Collection from a local index",
+    )
+    @click.argument("index_path", metavar="INDEX")
+    @click.argument("OUTDIR")
+    @click.option(
+        "-a",
+        "--antimeridian-strategy",
+        type=click.Choice(["normalize", "split"], case_sensitive=False),
+        default="split",
+        show_default=True,
+        help="Geometry strategy for antimeridian scenes",
+    )
+    @click.option(
+        "-v",
+        "--validate",
+        is_flag=True,
+        default=False,
+        help="Validate the Collection and Items (requires network access)",
+    )
+    @click.option(
+        "-l",
+        "--layout",
+        "layout_name",
+        type=click.Choice(layout.LAYOUTS, case_sensitive=False),
+        default="flat",
+        show_default=True,
+        help="Add Items directly to the Collection or to child Collections "
+        "by MGRS zone and latitude band, year, and month",
+    )
+    def create_collection_from_index_command(
+        index_path: str,
+        outdir: str,
+        antimeridian_strategy: str,
+        layout_name: str,
+        validate: bool,
+    ) -> None:
+        """Creates a STAC Collection with Items created from the granule
+        metadata in a local INDEX created by the harvest command. No granule
+        files are read.
+
+        \b
+        Args:
+            index_path (str): SQLite index file created by the harvest command.
+            outdir (str): Directory that will contain the collection.
+            antimeridian_strategy (str, optional): Choice of 'normalize' or
+                'split' to either split the Item geometry on -180 longitude or
+                normalize the Item geometry so all longitudes are either
+                positive or negative. Default is 'split'.
+            layout_name (str): Choice of 'flat' to add Items directly to the
+                Collection or 'tile-time' to add Items to child Collections by
+                MGRS zone and latitude band, year, and month. Default is
+                'flat'.
+            validate (bool): Flag to validate the Collection and Items. Fetching
+                the JSON schemas requires network access. Default is False.
+        """
+        strategy = Strategy[antimeridian_strategy.upper()]
+
+        collection = stac.create_collection()
+        collection.set_self_href(os.path.join(outdir, "collection.json"))
+
+        item_layout = layout.get_layout(layout_name.lower(), collection)
+        aggregator = ItemAggregator()
+        for record in index.read_index(index_path):
+            item = stac.create_item_from_record(record, antimeridian_strategy=strategy)
+            aggregator.add_item(item)
+            item_layout.add_item(item)
+        aggregator.update_collection(collection)
+        item_layout.finalize()
+
+        collection.catalog_type = CatalogType.SELF_CONTAINED
+        collection.make_all_asset_hrefs_relative()
+        if validate:
+            collection.validate_all()
+        writer.save_catalog(collection)
+
+        return None
+
+    @hls.command(
+        "inventory", short_help="Group granule file HREFs and check completeness"
+    )
+    @click.argument("INFILE")
+    @click.argument("OUTFILE")
+    @click.option(
+        "-i",
+        "--include-incomplete",
+        is_flag=True,
+        default=False,
+        help="Also list granules that are missing band COGs",
+    )
+    def inventory_command(infile: str, outfile: str, include_incomplete: bool) -> None:
+        """Groups the granule file HREFs listed in INFILE, e.g., a bucket
+        listing, by granule and writes one EO COG HREF for each complete
+        granule to OUTFILE, for use with the collection commands. Granules
+        that are missing band COGs are reported.
+
+        \b
+        Args:
+            infile (str): Text file containing one HREF per line. HREFs that
+                are not HLS granule files are ignored.
+            outfile (str): Text file to write one HREF per granule to.
+            include_incomplete (bool): Flag to also write HREFs for granules
+                that are missing band COGs. Default is False.
+        """
+        with open(infile) as f:
+            hrefs = [line.strip() for line in f if line.strip()]
+
+        hrefs_inventory = inventory.inventory_hrefs(hrefs)
+        granules = inventory.inventory_granules(hrefs_inventory)
+        for granule_id, missing in granules.missing_bands.items():
+            logger.warning(f"{granule_id} is missing {', '.join(missing)}")
+
+        selected = granules.href != ""
+        if not include_incomplete:
+            selected &= granules.complete
+        with open(outfile, "w") as f:
+            for href in granules.href[selected]:
+                f.write(f"{href}\n")
+        logger.info(
+            f"{len(granules.granule_id)} granules "
+            f"({int(granules.complete.sum())} complete) found in "
+            f"{int(hrefs_inventory.valid.sum())} of {len(hrefs)} HREFs"
+        )
+
+        return None
+
+    @hls.command(
+        "worker", short_help="Create STAC Items for granule HREFs from a queue"
+    )
+    @click.argument("OUTDIR")
+    @click.option(
+        "-s",
+        "--spool",
+        help="Spool directory of files that each hold a granule HREF. "
+        "Granule HREFs are read from stdin if not set",
+    )
+    @click.option(
+        "-e",
+        "--exit-when-empty",
+        is_flag=True,
+        default=False,
+        help="Exit once the spool directory is empty rather than polling",
+    )
+    @click.option(
+        "-w",
+        "--max-workers",
+        type=int,
+        default=worker.DEFAULT_MAX_WORKERS,
+        show_default=True,
+        help="Number of granules processed concurrently",
+    )
+    @click.option(
+        "-u",
+        "--use-raster-footprint",
+        is_flag=True,
+        default=False,
+        help="Use valid data pixels for Item geometry rather than XML metadata",
+    )
+    @_statistics_options
+    @click.option(
+        "-c",
+        "--check-existence",
+        is_flag=True,
+        default=False,
+        help="Check that all granule asset COGs exist",
+    )
+    @click.option(
+        "-a",
+        "--antimeridian-strategy",
+        type=click.Choice(["normalize", "split"], case_sensitive=False),
+        default="split",
+        show_default=True,
+        help="Geometry strategy for antimeridian scenes",
+    )
+    def worker_command(
+        outdir: str,
+        spool: str,
+        exit_when_empty: bool,
+        max_workers: int,
+        use_raster_footprint: bool,
+        fmask_statistics: bool,
+        raster_statistics: bool,
+        raster_histograms: bool,
+        check_existence: bool,
+        antimeridian_strategy: str,
+    ) -> None:
+        """Runs a long-lived worker that creates a STAC Item in OUTDIR for each
+        granule HREF received, one HREF per line on stdin or one HREF per file
+        in a spool directory. Stops at the end of stdin, when the spool
+        directory is empty if --exit-when-empty is set, or on SIGINT or
+        SIGTERM once in-flight granules are complete.
+
+        \b
+        Args:
+            outdir (str): Directory that will contain the STAC Items.
+            spool (str): Spool directory. Claimed files are moved to its
+                'processing' subdirectory and, if Item creation fails, to its
+                'failed' subdirectory.
+            exit_when_empty (bool): Flag to exit once the spool directory is
+                empty. Default is False.
+            max_workers (int): Number of granules processed concurrently.
+            use_raster_footprint (bool): Flag to use stactools raster_footprint
+                for the Item geometry rather than the boundary in the XML
+                metadata file.
+            fmask_statistics, raster_statistics, raster_histograms (bool):
+                Flags to add Fmask and `raster:bands` statistics, as described
+                in the option help. Default is False.
+            check_existence (bool): Flag to check that COGs exist for all
+                granule assets. Default is False.
+            antimeridian_strategy (str, optional): Choice of 'normalize' or
+                'split' to either split the Item geometry on -180 longitude or
+                normalize the Item geometry so all longitudes are either
+                positive or negative. Default is 'split'.
+        """
+        source: worker.QueueSource
+        if spool:
+            source = worker.SpoolSource(spool, exit_when_empty=exit_when_empty)
+        else:
+            source = worker.StreamSource()
+        item_worker = worker.Worker(
+            source,
+            worker.DirectorySink(outdir),
+            max_workers=max_workers,
+            use_raster_footprint=use_raster_footprint,
+            fmask_statistics=fmask_statistics,
+            raster_statistics=raster_statistics,
+            raster_histograms=raster_histograms,
+            check_existence=check_existence,
+            antimeridian_strategy=Strategy[antimeridian_strategy.upper()],
+        )
+
+        def _stop(signum: int, frame: Any) -> None:
+            item_worker.stop()
+
+        handlers = {
+            signum: signal.signal(signum, _stop)
+            for signum in [signal.SIGTERM, signal.SIGINT]
+        }
+        try:
+            item_worker.run()
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
 
         return None
 
     return hls
+
+
+def _read_hrefs(infile: str, reconcile_policy: Optional[str] = None) -> List[str]:
+    with open(infile) as f:
+        hrefs = [make_absolute_href(line.strip()) for line in f.readlines()]
+
+    if reconcile_policy:
+        reconciliation = reconcile.reconcile_hrefs(hrefs, reconcile_policy.lower())
+        hrefs = reconciliation.kept
+        logger.info(f"Dropped {len(reconciliation.dropped)} superseded granule HREFs")
+    return hrefs
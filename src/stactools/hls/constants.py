@@ -3,6 +3,25 @@ from typing import Any, Dict
 FOOTPRINT_DENSIFICATION_FACTOR = 10
 FOOTPRINT_SIMPLIFICATION_TOLERANCE = 0.0006  # degrees; approximately 60m
 
+# Maximum number of parsed HLS file HREFs kept by utils.parse_href
+HREF_CACHE_SIZE = 65536
+
+# Statistics are computed from the coarsest COG overview with at least this
+# many rows and columns
+RASTER_MIN_OVERVIEW_SIZE = 512
+RASTER_READ_MAX_WORKERS = 16
+# Rows of a decoded band processed at once, bounding temporary arrays
+RASTER_BLOCK_ROWS = 256
+HISTOGRAM_BUCKETS = 256
+
+FMASK_NODATA = 255
+FMASK_BITS = {
+    "cloud": 1,
+    "cloud_shadow": 3,
+    "snow_ice": 4,
+    "water": 5,
+}
+
 CLASSIFICATION_EXTENSION_HREF = (
     "https://stac-extensions.github.io/classification/v1.1.0/schema.json"
 )
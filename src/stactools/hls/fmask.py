@@ -0,0 +1,46 @@
+from typing import Dict
+
+import numpy as np
+
+from stactools.hls import constants
+from stactools.hls.raster import RasterData
+
+
+def fmask_statistics(raster: RasterData) -> Dict[str, float]:
+    """Computes cloud, cloud shadow, snow/ice, water, and valid data
+    percentages from a decoded HLS Fmask band.
+
+    The Fmask bits are decoded with vectorized operations, one block of
+    `RASTER_BLOCK_ROWS` rows at a time, so the temporary bit masks stay small
+    however large the band is. The class percentages are relative to the
+    number of valid (not nodata) pixels.
+
+    Args:
+        raster (RasterData): The decoded Fmask band, typically an overview
+            read by `GranuleRasters`.
+
+    Returns:
+        Dict[str, float]: Item properties, e.g., `hls:cloud_percentage`.
+    """
+    bits = np.array(list(constants.FMASK_BITS.values()), dtype=np.uint8)
+    masks = (np.uint8(1) << bits).reshape(-1, 1)
+    counts = np.zeros(len(bits), dtype=np.int64)
+    valid = 0
+    rows = constants.RASTER_BLOCK_ROWS
+    for start in range(0, raster.data.shape[0], rows):
+        stop = start + rows
+        block = raster.data[start:stop].reshape(1, -1)
+        is_valid = block != constants.FMASK_NODATA
+        counts += np.count_nonzero(((block & masks) != 0) & is_valid, axis=1)
+        valid += int(np.count_nonzero(is_valid))
+
+    statistics = {"hls:valid_data_percentage": _percent(valid, raster.data.size)}
+    for name, count in zip(constants.FMASK_BITS, counts):
+        statistics[f"hls:{name}_percentage"] = _percent(int(count), valid)
+    return statistics
+
+
+def _percent(count: int, total: int) -> float:
+    if total == 0:
+        return 0.0
+    return round(100 * count / total, 2)
@@ -1,4 +1,6 @@
+import copy
 import json
+from functools import lru_cache
 from typing import Any, Dict, List, Tuple
 
 import pkg_resources
@@ -6,7 +8,7 @@ from pystac import Extent, Link, MediaType, Provider
 from pystac.utils import make_absolute_href
 
 from stactools.hls.constants import BANDS
-from stactools.hls.utils import band_name_from_href, product_from_href
+from stactools.hls.utils import parse_href
 
 
 class STACFragments:
@@ -26,12 +28,13 @@ class STACFragments:
         Returns:
             Tuple[str, Dict[str, Any]]: Asset key and Asset dictionary
         """
-        band_name = band_name_from_href(href)
+        parsed = parse_href(href)
+        band_name = parsed.band
         if band_name in BANDS["common"]:
             asset_key = BANDS["common"][band_name]
             asset = self.assets[asset_key]
         else:
-            product = product_from_href(href)
+            product = parsed.product
             asset_key = BANDS[product][band_name]["common_name"]
             asset = self.assets[asset_key]
             asset["eo:bands"][0]["name"] = band_name
@@ -59,10 +62,17 @@ class STACFragments:
         return summary
 
     def _load(self, file_name: str) -> Any:
-        try:
-            with pkg_resources.resource_stream(
-                "stactools.hls.fragments", f"./{file_name}"
-            ) as stream:
-                return json.load(stream)
-        except FileNotFoundError as e:
-            raise e
+        return copy.deepcopy(_load_fragment(file_name))
+
+
+@lru_cache(maxsize=None)
+def _load_fragment(file_name: str) -> Any:
+    """Reads and parses a fragment file once per process. Callers must copy
+    the result before modifying it."""
+    try:
+        with pkg_resources.resource_stream(
+            "stactools.hls.fragments", f"./{file_name}"
+        ) as stream:
+            return json.load(stream)
+    except FileNotFoundError as e:
+        raise e
@@ -0,0 +1,176 @@
+import json
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from stactools.core.io import ReadHrefModifier
+
+from stactools.hls import utils
+from stactools.hls.metadata import GranuleRecord
+from stactools.hls.stac import create_granule_record
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS granules (
+    id TEXT PRIMARY KEY,
+    cog_href TEXT NOT NULL,
+    record TEXT NOT NULL
+)
+"""
+
+# Granules read between commits, and at most the SQLite parameter limit
+DEFAULT_BATCH_SIZE = 500
+
+
+class Harvest(NamedTuple):
+    """The result of `harvest`.
+
+    `harvested` is the number of granules written to the index. `skipped`
+    holds the ids of granules that were already in the index and were not
+    read. `failed` maps the HREF of each granule that could not be read to the
+    error message.
+    """
+
+    harvested: int
+    skipped: List[str]
+    failed: Dict[str, str]
+
+
+def harvest(
+    hrefs: Iterable[str],
+    index_path: str,
+    read_href_modifier: Optional[ReadHrefModifier] = None,
+    use_raster_footprint: bool = False,
+    fmask_statistics: bool = False,
+    raster_statistics: bool = False,
+    raster_histograms: bool = False,
+    max_workers: int = 1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    skip_existing: bool = False,
+) -> Harvest:
+    """Reads the metadata for a list of HLS granules into a local SQLite index.
+
+    Only the COG header (tags, transform, and CRS) and the XML metadata (or the
+    raster footprint) are read for each granule. Granules already in the index
+    are replaced, unless `skip_existing` is set.
+
+    Records are committed after every `batch_size` granules, so an interrupted
+    harvest keeps the granules already read and can be resumed with
+    `skip_existing`. Granules that cannot be read are logged and skipped.
+
+    Args:
+        hrefs (Iterable[str]): HREFs to a single EO COG file for each granule.
+        index_path (str): Path to the SQLite index file. It is created if it
+            does not exist.
+        read_href_modifier (ReadHrefModifier, optional): An optional
+            function to modify the href (e.g. to add a token to a url)
+        use_raster_footprint (bool): Flag to use the valid data pixels in the
+            COG for the granule geometry rather than the XML metadata.
+        fmask_statistics (bool): Flag to compute Fmask statistics for each
+            granule.
+        raster_statistics (bool): Flag to compute `raster:bands` statistics
+            for each granule.
+        raster_histograms (bool): Flag to also compute `raster:bands`
+            histograms for each granule.
+        max_workers (int): Number of threads used to read granule metadata.
+            Defaults to 1.
+        batch_size (int): Number of granules read between commits. Defaults
+            to `DEFAULT_BATCH_SIZE`.
+        skip_existing (bool): Flag to skip granules whose id is already in the
+            index, without reading them. Defaults to False.
+
+    Returns:
+        Harvest: The number of harvested granules and the skipped and failed
+        granules.
+    """
+    skipped: List[str] = []
+    failed: Dict[str, str] = {}
+
+    def _record(href: str) -> Optional[GranuleRecord]:
+        try:
+            return create_granule_record(
+                href,
+                read_href_modifier,
+                use_raster_footprint,
+                fmask_statistics,
+                raster_statistics,
+                raster_histograms,
+            )
+        except Exception as error:
+            logger.exception(f"Failed to harvest {href}")
+            failed[href] = str(error)
+            return None
+
+    harvested = 0
+    connection = sqlite3.connect(index_path)
+    try:
+        connection.execute(SCHEMA)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for batch in _batches(hrefs, batch_size):
+                if skip_existing:
+                    batch = _unindexed(connection, batch, skipped)
+                records = [r for r in executor.map(_record, batch) if r is not None]
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO granules VALUES (?, ?, ?)",
+                        [(r.id, r.cog_href, json.dumps(r.to_dict())) for r in records],
+                    )
+                harvested += len(records)
+                logger.debug(f"Harvested {harvested} granules")
+    finally:
+        connection.close()
+    return Harvest(harvested=harvested, skipped=skipped, failed=failed)
+
+
+def _batches(hrefs: Iterable[str], batch_size: int) -> Iterator[List[str]]:
+    iterator = iter(hrefs)
+    batch = list(islice(iterator, batch_size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, batch_size))
+
+
+def _unindexed(
+    connection: sqlite3.Connection, hrefs: List[str], skipped: List[str]
+) -> List[str]:
+    ids = {}
+    for href in hrefs:
+        try:
+            ids[href] = utils.id_from_href(href)
+        except utils.InvalidHref:
+            # Left for `create_granule_record` to fail and report
+            ids[href] = ""
+    placeholders = ", ".join("?" * len(ids))
+    existing = {
+        granule_id
+        for (granule_id,) in connection.execute(
+            f"SELECT id FROM granules WHERE id IN ({placeholders})", list(ids.values())
+        )
+    }
+    unindexed = []
+    for href, granule_id in ids.items():
+        if granule_id in existing:
+            skipped.append(granule_id)
+        else:
+            unindexed.append(href)
+    return unindexed
+
+
+def read_index(index_path: str) -> Iterator[GranuleRecord]:
+    """Yields the granule records in a SQLite index, ordered by granule id.
+
+    Args:
+        index_path (str): Path to a SQLite index created by `harvest`.
+
+    Returns:
+        Iterator[GranuleRecord]: Granule records.
+    """
+    connection = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+    try:
+        for (record,) in connection.execute("SELECT record FROM granules ORDER BY id"):
+            yield GranuleRecord.from_dict(json.loads(record))
+    finally:
+        connection.close()
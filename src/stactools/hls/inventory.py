@@ -0,0 +1,308 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from stactools.hls import constants, utils
+
+# Character offsets of the fixed-width fields in an HLS file name, e.g.,
+# HLS.L30.T19LDD.2022165T144027.v2.0.B01.tif
+GRANULE_ID_LENGTH = 34
+BAND_OFFSET = GRANULE_ID_LENGTH + 1
+
+BAND_NAMES = np.array(
+    sorted(
+        {
+            band
+            for product in ["L30", "S30", "common"]
+            for band in constants.BANDS[product]
+        }
+    )
+)
+
+HrefArray = Union[Iterable[str], npt.NDArray[Any]]
+
+
+class HrefInventory(NamedTuple):
+    """Parsed fields of a list of HLS file HREFs, one array per field.
+
+    Fields of invalid HREFs (where `valid` is False) are empty strings and
+    NaT.
+    """
+
+    href: npt.NDArray[np.str_]
+    valid: npt.NDArray[np.bool_]
+    granule_id: npt.NDArray[np.str_]
+    product: npt.NDArray[np.str_]
+    tile_id: npt.NDArray[np.str_]
+    acquisition_date: npt.NDArray[np.datetime64]
+    version: npt.NDArray[np.str_]
+    band: npt.NDArray[np.str_]
+    extension: npt.NDArray[np.str_]
+
+
+class GranuleInventory(NamedTuple):
+    """Granules found in an `HrefInventory`, one array per field.
+
+    `href` is the HREF to one EO band COG of the granule, suitable for
+    `create_item`, or an empty string if there are no EO band COGs.
+    `band_count` is the number of COGs found for the bands expected for the
+    product, and `missing_bands` lists the missing bands of each incomplete
+    granule by granule id.
+    """
+
+    granule_id: npt.NDArray[np.str_]
+    href: npt.NDArray[np.str_]
+    product: npt.NDArray[np.str_]
+    tile_id: npt.NDArray[np.str_]
+    acquisition_date: npt.NDArray[np.datetime64]
+    version: npt.NDArray[np.str_]
+    band_count: npt.NDArray[np.int64]
+    complete: npt.NDArray[np.bool_]
+    missing_bands: Dict[str, List[str]]
+
+
+def inventory_hrefs(hrefs: HrefArray) -> HrefInventory:
+    """Parses many HLS file HREFs at once with vectorized string operations.
+
+    HLS file names have fixed-width fields up to the band name, so the file
+    names are viewed as a two-dimensional character array and each field is
+    checked and extracted for all HREFs at once. The few HREFs that do not
+    have the fixed-width layout, e.g., a two-digit version, are parsed with
+    `utils.parse_href`. The result matches `utils.parse_href`: an HREF is
+    valid if and only if `parse_href` does not raise.
+
+    Args:
+        hrefs (HrefArray): HREFs to HLS granule files. Any sequence or
+            array-like of strings is accepted, including a NumPy array or an
+            Arrow string column.
+
+    Returns:
+        HrefInventory: The parsed fields, one array per field.
+    """
+    if not hasattr(hrefs, "__len__"):
+        hrefs = list(hrefs)
+    href = np.asarray(hrefs).reshape(-1)
+    if href.dtype.kind != "U":
+        href = href.astype(np.str_)
+    if href.size == 0:
+        empty = href.astype("U1")
+        return HrefInventory(
+            href,
+            np.zeros(0, dtype=bool),
+            empty,
+            empty,
+            empty,
+            np.zeros(0, dtype="datetime64[D]"),
+            empty,
+            empty,
+            empty,
+        )
+    # Drop any URL fragment and query, as `urlsplit` does, before the path
+    path = np.char.partition(np.char.partition(href, "#")[:, 0], "?")[:, 0]
+    filename = np.char.rpartition(path, "/")[:, 2]
+    width = max(filename.dtype.itemsize // 4, BAND_OFFSET + 3)
+    # One row of UTF-32 code points per file name
+    chars = filename.astype(f"U{width}").view(np.uint32).reshape(-1, width)
+
+    band, dot, extension = _band_extension(chars)
+    valid = (
+        _equal(chars, 0, "HLS")
+        & (_equal(chars, 4, "L30") | _equal(chars, 4, "S30"))
+        & _equal(chars, 8, "T")
+        & _is_digit(chars, 9, 11)
+        & _between(chars, 11, 12, "C", "X")
+        & _between(chars, 12, 14, "A", "Z")
+        & _is_digit(chars, 15, 22)
+        & _equal(chars, 22, "T")
+        & _is_digit(chars, 23, 29)
+        & _equal(chars, 30, "v")
+        & _is_digit(chars, 31, 32)
+        & _equal(chars, 32, ".")
+        & _is_digit(chars, 33, 34)
+        & _is_word(band)
+        & (dot == ".")
+        & _is_word(extension)
+    )
+    for position in [3, 7, 14, 29, 34]:
+        valid &= _equal(chars, position, ".")
+
+    # The sensing time must be a valid date and time, as for `utils.parse_href`
+    year = _number(chars, 15, 19)
+    day = _number(chars, 19, 22)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    valid &= (
+        (day >= 1)
+        & (day <= 365 + leap)
+        & (_number(chars, 23, 25) < 24)
+        & (_number(chars, 25, 27) < 60)
+        & (_number(chars, 27, 29) < 60)
+    )
+    acquisition_date: npt.NDArray[Any] = (year - 1970).astype("datetime64[Y]").astype(
+        "datetime64[D]"
+    ) + (day - 1)
+    acquisition_date[~valid] = np.datetime64("NaT")
+    inventory = HrefInventory(
+        href=href,
+        valid=valid,
+        granule_id=np.where(valid, _join(chars, 0, GRANULE_ID_LENGTH), ""),
+        product=np.where(valid, _join(chars, 4, 7), ""),
+        tile_id=np.where(valid, _join(chars, 8, 14), ""),
+        acquisition_date=acquisition_date,
+        version=np.where(valid, _join(chars, 30, 34), ""),
+        band=np.where(valid, band, ""),
+        extension=np.where(valid, extension, ""),
+    )
+    irregular = np.flatnonzero(~valid & _equal(chars, 0, "HLS."))
+    return _parse_irregular(inventory, irregular)
+
+
+def inventory_granules(inventory: HrefInventory) -> GranuleInventory:
+    """Groups the COG HREFs in an inventory by granule and checks each
+    granule's bands against `constants.BANDS` in a single pass.
+
+    The bands found for each granule are accumulated as a bit set, so the set
+    of missing bands for every granule is computed with array operations.
+
+    Args:
+        inventory (HrefInventory): An inventory created by `inventory_hrefs`.
+
+    Returns:
+        GranuleInventory: The granules, one array per field.
+    """
+    cogs = inventory.valid & (inventory.extension == "tif")
+    band = inventory.band[cogs]
+    product = inventory.product[cogs]
+
+    positions = np.searchsorted(BAND_NAMES, band).clip(0, len(BAND_NAMES) - 1)
+    known = BAND_NAMES[positions] == band
+    bits = np.where(known, np.uint64(1) << positions.astype(np.uint64), 0).astype(
+        np.uint64
+    )
+    is_eo = np.zeros(band.shape, dtype=bool)
+    for name in ["L30", "S30"]:
+        eo_mask = _band_mask(constants.BANDS[name])
+        is_eo |= (product == name) & ((bits & eo_mask) != 0)
+
+    # Sort EO band rows first so each granule's first row is an EO band COG.
+    order = np.argsort(~is_eo, kind="stable")
+    granule_id = inventory.granule_id[cogs][order]
+    ids, first, granule_index = np.unique(
+        granule_id, return_index=True, return_inverse=True
+    )
+    found = np.zeros(ids.shape, dtype=np.uint64)
+    np.bitwise_or.at(found, granule_index, bits[order])
+
+    granule_product = product[order][first]
+    expected = np.zeros(ids.shape, dtype=np.uint64)
+    for name in ["L30", "S30"]:
+        mask = _band_mask(constants.BANDS[name]) | _band_mask(constants.BANDS["common"])
+        expected[granule_product == name] = mask
+    found &= expected
+    missing = expected & ~found
+
+    missing_bits = _unpack(missing)
+    complete = np.asarray(~missing_bits.any(axis=1))
+    missing_bands = {
+        str(ids[i]): BAND_NAMES[missing_bits[i]].tolist()
+        for i in np.flatnonzero(~complete)
+    }
+
+    cog_rows = np.flatnonzero(cogs)[order][first]
+    return GranuleInventory(
+        granule_id=ids,
+        href=np.where(is_eo[order][first], inventory.href[cog_rows], ""),
+        product=granule_product,
+        tile_id=inventory.tile_id[cog_rows],
+        acquisition_date=inventory.acquisition_date[cog_rows],
+        version=inventory.version[cog_rows],
+        band_count=_unpack(found).sum(axis=1).astype(np.int64),
+        complete=complete,
+        missing_bands=missing_bands,
+    )
+
+
+def _join(chars: npt.NDArray[np.uint32], start: int, stop: int) -> npt.NDArray[Any]:
+    field = np.ascontiguousarray(chars[:, start:stop])
+    return field.view(f"U{stop - start}").reshape(-1)
+
+
+def _equal(chars: npt.NDArray[np.uint32], start: int, value: str) -> npt.NDArray[Any]:
+    codes = np.array([ord(c) for c in value], dtype=np.uint32)
+    stop = start + len(value)
+    equal: npt.NDArray[Any] = np.all(chars[:, start:stop] == codes, axis=1)
+    return equal
+
+
+def _between(
+    chars: npt.NDArray[np.uint32], start: int, stop: int, low: str, high: str
+) -> npt.NDArray[Any]:
+    field = chars[:, start:stop]
+    between: npt.NDArray[Any] = np.all(
+        (field >= ord(low)) & (field <= ord(high)), axis=1
+    )
+    return between
+
+
+def _is_digit(chars: npt.NDArray[np.uint32], start: int, stop: int) -> npt.NDArray[Any]:
+    return _between(chars, start, stop, "0", "9")
+
+
+def _number(chars: npt.NDArray[np.uint32], start: int, stop: int) -> npt.NDArray[Any]:
+    digits = chars[:, start:stop].astype(np.int64) - ord("0")
+    powers = 10 ** np.arange(stop - start - 1, -1, -1, dtype=np.int64)
+    number: npt.NDArray[Any] = digits @ powers
+    return number
+
+
+def _is_word(values: npt.NDArray[Any]) -> npt.NDArray[Any]:
+    return np.char.isalnum(np.char.replace(values, "_", "a"))
+
+
+def _band_extension(chars: npt.NDArray[np.uint32]) -> Any:
+    parts = np.char.rpartition(_join(chars, BAND_OFFSET, chars.shape[1]), ".")
+    return parts[:, 0], parts[:, 1], parts[:, 2]
+
+
+def _band_mask(bands: Iterable[str]) -> np.uint64:
+    positions = np.searchsorted(BAND_NAMES, list(bands)).astype(np.uint64)
+    mask: np.uint64 = np.bitwise_or.reduce(
+        np.uint64(1) << positions, initial=np.uint64(0)
+    )
+    return mask
+
+
+def _unpack(masks: npt.NDArray[np.uint64]) -> npt.NDArray[np.bool_]:
+    bits = np.unpackbits(masks.astype("<u8").view(np.uint8), bitorder="little")
+    return bits.reshape(-1, 64)[:, : len(BAND_NAMES)].astype(bool)
+
+
+def _parse_irregular(
+    inventory: HrefInventory, candidates: npt.NDArray[np.intp]
+) -> HrefInventory:
+    rows = []
+    for i in candidates:
+        try:
+            rows.append((i, utils.parse_href(str(inventory.href[i]))))
+        except utils.InvalidHref:
+            continue
+    if not rows:
+        return inventory
+
+    index = np.array([i for i, _ in rows])
+    columns = inventory._asdict()
+    columns["valid"] = inventory.valid.copy()
+    columns["valid"][index] = True
+    for name in ["granule_id", "product", "tile_id", "version", "band", "extension"]:
+        values = np.array([getattr(parsed, name) for _, parsed in rows])
+        column = columns[name]
+        column = column.astype(np.promote_types(column.dtype, values.dtype))
+        column[index] = values
+        columns[name] = column
+    columns["acquisition_date"] = inventory.acquisition_date.copy()
+    columns["acquisition_date"][index] = [
+        datetime.strptime(parsed.sensing_time, "%Y%jT%H%M%S").date()
+        for _, parsed in rows
+    ]
+    return HrefInventory(**columns)
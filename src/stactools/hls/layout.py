@@ -0,0 +1,185 @@
+from typing import Dict, List, Optional, Tuple
+
+from pystac import Catalog, Collection, Item, Link
+from pystac.utils import make_absolute_href
+
+from stactools.hls.aggregate import ItemAggregator
+
+LAYOUTS = ["flat", "tile-time"]
+
+
+class FlatLayout:
+    """Adds every Item directly to the Collection."""
+
+    def __init__(self, collection: Collection) -> None:
+        self.collection = collection
+
+    def parent(self, item: Item) -> Catalog:
+        """Returns the Catalog that an Item is added to.
+
+        Args:
+            item (Item): An HLS STAC Item.
+
+        Returns:
+            Catalog: The parent Catalog or Collection.
+        """
+        return self.collection
+
+    def add_item(self, item: Item, count: bool = True) -> Link:
+        """Adds an Item to the Collection.
+
+        Args:
+            item (Item): An HLS STAC Item.
+            count (bool): Flag to count the Item in aggregated Item counts.
+                Defaults to True.
+
+        Returns:
+            Link: The Item link.
+        """
+        return self.collection.add_item(item)
+
+    def finalize(self) -> None:
+        """Completes the layout once all Items are added."""
+        pass
+
+
+class TileTimeLayout(FlatLayout):
+    """Adds Items to a hierarchy of child Collections by MGRS UTM zone and
+    latitude band, then year, then month, e.g., `hls-19L/hls-19L-2022/
+    hls-19L-2022-06/`.
+
+    Keeps each link list small for very large Collections. Items keep the root
+    Collection as their `collection`, as in the flat layout. The extent and
+    summaries of each child Collection are aggregated from only its own Items.
+    Child Collections that already exist in a Collection read from a file are
+    read only when an Item is added to them.
+    """
+
+    def __init__(self, collection: Collection) -> None:
+        super().__init__(collection)
+        self._children: Dict[str, Tuple[Collection, ItemAggregator]] = {}
+        self._child_links: Dict[str, Dict[Optional[str], Link]] = {}
+
+    def parent(self, item: Item) -> Catalog:
+        """Returns the child Collection for the Item's tile and month,
+        creating child Collections as needed.
+
+        Args:
+            item (Item): An HLS STAC Item.
+
+        Returns:
+            Catalog: The parent Collection.
+        """
+        leaf, _ = self._branch(item)[-1]
+        return leaf
+
+    def add_item(self, item: Item, count: bool = True) -> Link:
+        """Adds an Item to the child Collection for its tile and month,
+        creating child Collections as needed.
+
+        Args:
+            item (Item): An HLS STAC Item.
+            count (bool): Flag to count the Item in the child Collection Item
+                counts. Set to False when the Item replaces an Item that is
+                already counted. Defaults to True.
+
+        Returns:
+            Link: The Item link.
+        """
+        branch = self._branch(item)
+        for _, aggregator in branch:
+            aggregator.add_item(item, count)
+        leaf, _ = branch[-1]
+        link = leaf.add_item(item)
+        # Items belong to the root Collection, not to the child Collection
+        item.set_collection(self.collection)
+        return link
+
+    def finalize(self) -> None:
+        """Sets the extent and summaries of each child Collection."""
+        for child, aggregator in self._children.values():
+            aggregator.update_collection(child)
+
+    def _branch(self, item: Item) -> List[Tuple[Collection, ItemAggregator]]:
+        assert item.datetime is not None
+        zone = item.properties["mgrs:utm_zone"]
+        band = item.properties["mgrs:latitude_band"]
+        tile_key = f"{self.collection.id}-{zone:02d}{band}"
+        year_key = f"{tile_key}-{item.datetime.year}"
+        month_key = f"{year_key}-{item.datetime.month:02d}"
+
+        branch = []
+        parent = self.collection
+        for key, description in [
+            (tile_key, f"MGRS UTM zone {zone:02d} latitude band {band}"),
+            (year_key, f"MGRS zone {zone:02d}{band}, {item.datetime.year}"),
+            (
+                month_key,
+                f"MGRS zone {zone:02d}{band}, "
+                f"{item.datetime.year}-{item.datetime.month:02d}",
+            ),
+        ]:
+            if key not in self._children:
+                existing = self._existing_child(parent, key)
+                if existing is not None:
+                    self._children[key] = (
+                        existing,
+                        ItemAggregator.from_collection(existing),
+                    )
+                else:
+                    child = self._create_child(key, description)
+                    parent.add_child(child)
+                    self._children[key] = (child, ItemAggregator())
+            branch.append(self._children[key])
+            parent = self._children[key][0]
+        return branch
+
+    def _existing_child(self, parent: Collection, id: str) -> Optional[Collection]:
+        parent_href = parent.get_self_href()
+        if parent_href is None:
+            return None
+        if parent.id not in self._child_links:
+            # Links read from a file that have not been resolved yet
+            self._child_links[parent.id] = {
+                link.get_absolute_href(): link
+                for link in parent.get_child_links()
+                if not link.is_resolved()
+            }
+        href = make_absolute_href(f"./{id}/collection.json", parent_href)
+        link = self._child_links[parent.id].pop(href, None)
+        if link is None:
+            return None
+        link.resolve_stac_object(root=parent.get_root())
+        child = link.target
+        assert isinstance(child, Collection)
+        child.set_parent(parent)
+        return child
+
+    def _create_child(self, id: str, description: str) -> Collection:
+        return Collection(
+            id=id,
+            title=f"{self.collection.title} - {description}",
+            description=f"{self.collection.description}\n\n{description}.",
+            license=self.collection.license,
+            extent=self.collection.extent.clone(),
+        )
+
+
+def get_layout(name: str, collection: Collection) -> FlatLayout:
+    """Returns the Item layout for a Collection.
+
+    Args:
+        name (str): Either 'flat', to add Items directly to the Collection, or
+            'tile-time', to add Items to child Collections by MGRS zone and
+            latitude band, year, and month.
+        collection (Collection): The Collection.
+
+    Returns:
+        FlatLayout: The Item layout.
+    """
+    if name == "flat":
+        return FlatLayout(collection)
+    elif name == "tile-time":
+        return TileTimeLayout(collection)
+    else:
+        raise ValueError(f"Unknown layout '{name}', expected one of {LAYOUTS}")
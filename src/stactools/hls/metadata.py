@@ -1,11 +1,13 @@
+import mmap
 import re
 from datetime import datetime
-from typing import Any, Dict, Optional
+from functools import cached_property
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
 
 import fsspec
 import rasterio
 import untangle
-from dateutil.parser import parse
+from defusedxml.sax import make_parser
 from pystac.utils import datetime_to_str
 from shapely.geometry import MultiPolygon, Polygon, mapping
 from shapely.geometry.polygon import orient
@@ -13,7 +15,7 @@ from stactools.core.io import ReadHrefModifier
 from stactools.core.projection import epsg_from_utm_zone_number
 from stactools.core.utils.raster_footprint import data_footprint
 
-from stactools.hls import constants, utils
+from stactools.hls import constants, fmask, raster, utils
 
 
 class IncorrectAssetHref(Exception):
@@ -28,6 +30,119 @@ class GeometryError(Exception):
     """Error creating the Item geometry."""
 
 
+UTM_ZONE_PATTERN = re.compile(r"UTM Zone (\d+)", re.I)
+
+
+DATETIME_FIELDS = ["acquisition_datetime", "start_datetime", "end_datetime"]
+
+
+class GranuleRecord(NamedTuple):
+    """Compact, picklable record of the granule fields needed to create an
+    Item.
+
+    Unlike `Metadata`, a record does not keep the raw COG tags or CRS WKT
+    string, so it is cheap to send between processes, e.g., from I/O-bound
+    workers that read granule metadata to CPU-bound workers that create Items.
+    """
+
+    cog_href: str
+    id: str
+    product: str
+    acquisition_datetime: datetime
+    start_datetime: Optional[datetime]
+    end_datetime: Optional[datetime]
+    cloud_cover: int
+    azimuth: float
+    sun_azimuth: float
+    epsg: int
+    shape: Tuple[int, int]
+    transform: Tuple[float, float, float, float, float, float]
+    platform: str
+    mgrs_utm_zone: int
+    mgrs_latitude_band: str
+    mgrs_grid_square: str
+    geometry: Dict[str, Any]
+    fmask_statistics: Optional[Dict[str, float]] = None
+    raster_statistics: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @property
+    def mgrs(self) -> Dict[str, Any]:
+        return {
+            "mgrs:utm_zone": self.mgrs_utm_zone,
+            "mgrs:latitude_band": self.mgrs_latitude_band,
+            "mgrs:grid_square": self.mgrs_grid_square,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a JSON-serializable dictionary of the record fields."""
+        record = self._asdict()
+        for key in DATETIME_FIELDS:
+            if record[key] is not None:
+                record[key] = datetime_to_str(record[key])
+        record["shape"] = list(self.shape)
+        record["transform"] = list(self.transform)
+        return record
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "GranuleRecord":
+        """Creates a record from a dictionary created by `to_dict`."""
+        d = dict(d)
+        for key in DATETIME_FIELDS:
+            if d[key] is not None:
+                d[key] = utils.parse_hls_datetime(d[key])
+        d["shape"] = tuple(d["shape"])
+        d["transform"] = tuple(d["transform"])
+        return cls(**d)
+
+
+class CogHeader(NamedTuple):
+    """The COG header fields used for granule metadata."""
+
+    transform: List[float]
+    shape: List[int]
+    tags: Dict[str, str]
+    wkt: str
+
+
+def read_cog_header(href: str) -> CogHeader:
+    """Reads the transform, shape, tags, and CRS of a COG.
+
+    Local COGs are opened by path, so GDAL reads them with its native file
+    handler.
+
+    Args:
+        href (str): HREF to the COG, already modified for reading if needed.
+
+    Returns:
+        CogHeader: The COG header fields.
+    """
+    with rasterio.open(utils.local_path(href) or href) as dataset:
+        return CogHeader(
+            transform=list(dataset.transform[0:6]),
+            shape=list(dataset.shape),
+            tags=dataset.tags(),
+            wkt=dataset.crs.wkt,
+        )
+
+
+def parse_xml(data: Union[bytes, mmap.mmap]) -> Any:
+    """Parses an XML document held in memory, e.g., a memory-mapped CMR XML
+    metadata file, without copying it.
+
+    Args:
+        data (Union[bytes, mmap.mmap]): The XML document.
+
+    Returns:
+        Any: The root `untangle.Element` of the document.
+    """
+    parser = make_parser()
+    handler = untangle.Handler()
+    parser.setContentHandler(handler)
+    parser.feed(data)
+    parser.close()
+    return handler.root
+
+
 class Metadata:
     """Structure to hold metadata about an HLS granule."""
 
@@ -35,6 +150,8 @@ class Metadata:
         self,
         cog_href: str,
         read_href_modifier: Optional[ReadHrefModifier] = None,
+        header: Optional[CogHeader] = None,
+        cmr_xml: Optional[bytes] = None,
     ) -> None:
         """Extracts granule metadata from COG and XML files.
 
@@ -43,23 +160,31 @@ class Metadata:
             read_href_modifier (ReadHrefModifier, optional): An
                 optional function to modify the href (e.g. to add a token to a
                 url)
+            header (CogHeader, optional): The already read COG header. If not
+                set, the header is read from `cog_href`.
+            cmr_xml (bytes, optional): The already read CMR XML metadata file.
+                If not set, the file is read when the XML geometry is needed.
         """
         self.cog_href = cog_href
         self.read_href_modifier = read_href_modifier
+        self.xml_href = utils.cmr_xml_href(cog_href)
+        self.cmr_xml = cmr_xml
 
         self.read_cog_href = utils.modify_href(cog_href, read_href_modifier)
-        with rasterio.open(self.read_cog_href) as dataset:
-            self.transform = list(dataset.transform[0:6])
-            self.shape = list(dataset.shape)
-            self.tags = dataset.tags()
-            self.wkt = dataset.crs.wkt
-
-        self.sensing_time = [parse(dt) for dt in self.tags["SENSING_TIME"].split(";")]
-
-    @property
+        if header is None:
+            header = read_cog_header(self.read_cog_href)
+        self.transform = header.transform
+        self.shape = header.shape
+        self.tags = header.tags
+        self.wkt = header.wkt
+
+        self.sensing_time = [
+            utils.parse_hls_datetime(dt) for dt in self.tags["SENSING_TIME"].split(";")
+        ]
+
+    @cached_property
     def epsg(self) -> int:
-        pattern = re.compile(r"UTM Zone (\d+)", re.I)
-        search = pattern.search(self.wkt)
+        search = UTM_ZONE_PATTERN.search(self.wkt)
         if search:
             utm_zone = int(search.group(1))
             return epsg_from_utm_zone_number(utm_zone, south=False)
@@ -80,17 +205,17 @@ class Metadata:
     def azimuth(self) -> float:
         return round(float(self.tags["MEAN_VIEW_AZIMUTH_ANGLE"]), 1)
 
-    @property
+    @cached_property
     def processing_datetime(self) -> datetime:
-        t: datetime = parse(self.tags["HLS_PROCESSING_TIME"])
+        t: datetime = utils.parse_hls_datetime(self.tags["HLS_PROCESSING_TIME"])
         return t
 
-    @property
+    @cached_property
     def acquisition_datetime(self) -> datetime:
         t: datetime = min(self.sensing_time)
         return t
 
-    @property
+    @cached_property
     def start_end_datetime(self) -> Optional[Dict[str, str]]:
         se_datetime = None
         if len(self.sensing_time) > 1:
@@ -100,7 +225,7 @@ class Metadata:
             }
         return se_datetime
 
-    @property
+    @cached_property
     def platform(self) -> str:
         # Handles multiple platforms in a single granule; unknown if that actually occurs
         platforms = set()
@@ -114,13 +239,13 @@ class Metadata:
         platform = ", ".join(platforms)
         return platform
 
-    @property
+    @cached_property
     def mgrs(self) -> Dict[str, Any]:
-        tile_id = utils.tile_id_from_href(self.cog_href)
+        parsed = utils.parse_href(self.cog_href)
         mgrs = {
-            "mgrs:utm_zone": int(tile_id[1:3]),
-            "mgrs:latitude_band": tile_id[3],
-            "mgrs:grid_square": tile_id[4:],
+            "mgrs:utm_zone": parsed.utm_zone,
+            "mgrs:latitude_band": parsed.latitude_band,
+            "mgrs:grid_square": parsed.grid_square,
         }
         return mgrs
 
@@ -137,6 +262,8 @@ class Metadata:
             Dict[str, Any]: data boundary in GeoJSON form.
         """
         if use_raster_footprint:
+            # Always the full resolution EO band, so the geometry does not
+            # depend on which statistics are requested
             footprint: Optional[Dict[str, Any]] = data_footprint(
                 self.read_cog_href,
                 densification_factor=constants.FOOTPRINT_DENSIFICATION_FACTOR,
@@ -151,14 +278,117 @@ class Metadata:
         else:
             return self._xml_geometry()
 
-    def _xml_geometry(self) -> Dict[str, Any]:
-        parts = self.cog_href.split(".")[:-2]
-        self.xml_href = f"{'.'.join(parts)}.cmr.xml"
-        read_xml_href = utils.modify_href(self.xml_href, self.read_href_modifier)
+    @cached_property
+    def rasters(self) -> raster.GranuleRasters:
+        """Decoded granule COG overviews, shared between the Fmask and
+        `raster:bands` statistics."""
+        return raster.GranuleRasters(self.read_href_modifier)
+
+    def fmask_statistics(self) -> Dict[str, float]:
+        """Computes cloud, cloud shadow, snow/ice, water, and valid data
+        percentages from an overview of the granule Fmask COG.
+
+        Returns:
+            Dict[str, float]: Item properties, e.g., `hls:cloud_percentage`.
+        """
+        fmask_href = utils.band_href(self.cog_href, "Fmask")
+        return fmask.fmask_statistics(self.rasters.read(fmask_href))
+
+    def raster_statistics(self, histogram: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Computes `raster:bands` statistics, and optionally histograms, from
+        overviews of all granule COGs, reading the COGs concurrently.
+
+        Args:
+            histogram (bool): Flag to include a histogram for each band.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: `raster:bands` fields by band name,
+            e.g., 'B01' or 'Fmask'.
+        """
+        product = utils.product_from_href(self.cog_href)
+        hrefs = utils.create_cog_hrefs(self.cog_href, product, False)
+        statistics = self.rasters.map(
+            hrefs, lambda band: raster.band_statistics(band, histogram)
+        )
+        return {
+            utils.band_name_from_href(href): fields
+            for href, fields in statistics.items()
+        }
 
-        with fsspec.open(read_xml_href) as file:
-            cmr = untangle.parse(file)
-            granule = cmr.Granule
+    def to_record(
+        self,
+        use_raster_footprint: bool = False,
+        fmask_statistics: bool = False,
+        raster_statistics: bool = False,
+        raster_histograms: bool = False,
+    ) -> GranuleRecord:
+        """Creates a compact record of the fields needed to create an Item.
+
+        Args:
+            use_raster_footprint (bool): Flag to use the valid data pixels in
+                the COG for the record geometry rather than the XML metadata.
+            fmask_statistics (bool): Flag to compute Fmask statistics.
+            raster_statistics (bool): Flag to compute `raster:bands` statistics
+                for every granule COG. The Fmask overview read for these is
+                also used for the Fmask statistics.
+            raster_histograms (bool): Flag to also compute `raster:bands`
+                histograms. Implies `raster_statistics`.
+
+        Returns:
+            GranuleRecord: Record of the granule Item fields.
+        """
+        raster_statistics = raster_statistics or raster_histograms
+        parsed = utils.parse_href(self.cog_href)
+
+        start_datetime = None
+        end_datetime = None
+        if len(self.sensing_time) > 1:
+            start_datetime = min(self.sensing_time)
+            end_datetime = max(self.sensing_time)
+        return GranuleRecord(
+            cog_href=self.cog_href,
+            id=parsed.granule_id,
+            product=parsed.product,
+            acquisition_datetime=self.acquisition_datetime,
+            start_datetime=start_datetime,
+            end_datetime=end_datetime,
+            cloud_cover=self.cloud_cover,
+            azimuth=self.azimuth,
+            sun_azimuth=self.sun_azimuth,
+            epsg=self.epsg,
+            shape=(self.shape[0], self.shape[1]),
+            transform=(
+                self.transform[0],
+                self.transform[1],
+                self.transform[2],
+                self.transform[3],
+                self.transform[4],
+                self.transform[5],
+            ),
+            platform=self.platform,
+            mgrs_utm_zone=self.mgrs["mgrs:utm_zone"],
+            mgrs_latitude_band=self.mgrs["mgrs:latitude_band"],
+            mgrs_grid_square=self.mgrs["mgrs:grid_square"],
+            geometry=self.geometry(use_raster_footprint),
+            fmask_statistics=self.fmask_statistics() if fmask_statistics else None,
+            raster_statistics=(
+                self.raster_statistics(raster_histograms) if raster_statistics else None
+            ),
+        )
+
+    def _xml_geometry(self) -> Dict[str, Any]:
+        if self.cmr_xml is not None:
+            cmr = parse_xml(self.cmr_xml)
+        else:
+            read_xml_href = utils.modify_href(self.xml_href, self.read_href_modifier)
+            path = utils.local_path(read_xml_href)
+            if path is not None:
+                with utils.map_file(path) as buffer:
+                    cmr = parse_xml(buffer)
+            else:
+                with fsspec.open(read_xml_href) as file:
+                    cmr = untangle.parse(file)
+        granule = cmr.Granule
 
         polygons = []
         for poly in granule.Spatial.HorizontalSpatialDomain.Geometry.GPolygon:
@@ -200,12 +430,23 @@ def hls_metadata(
     Returns:
         Metadata: a dataclass containing metadata generated from the COG HREF.
     """
-    product = utils.product_from_href(cog_href)
-    band_name = utils.band_name_from_href(cog_href)
-    if band_name not in constants.BANDS[product]:
+    check_cog_href(cog_href)
+    return Metadata(cog_href, read_href_modifier)
+
+
+def check_cog_href(cog_href: str) -> None:
+    """Checks that a COG HREF is for an EO data band of an HLS granule.
+
+    Args:
+        cog_href (str): HREF to a single COG asset of an HLS granule.
+
+    Raises:
+        IncorrectAssetHref: If the COG is not for an EO data band.
+    """
+    parsed = utils.parse_href(cog_href)
+    band_name = parsed.band
+    if band_name not in constants.BANDS[parsed.product]:
         raise IncorrectAssetHref(
             f"A STAC Item can not be created from an Fmask, SAA, SZA, VAA, or "
             f"VZA COG HREF. A '{band_name}' COG HREF was supplied."
         )
-
-    return Metadata(cog_href, read_href_modifier)
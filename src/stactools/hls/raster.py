@@ -0,0 +1,202 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+import rasterio
+from affine import Affine
+from rasterio.crs import CRS
+from rasterio.io import DatasetReader
+from stactools.core.io import ReadHrefModifier
+
+from stactools.hls import constants, utils
+
+T = TypeVar("T")
+
+
+class RasterData(NamedTuple):
+    """A decoded COG band, at full resolution or an overview level."""
+
+    data: npt.NDArray[Any]
+    nodata: Optional[float]
+    transform: Affine
+    crs: CRS
+
+    def valid_mask(self) -> npt.NDArray[np.bool_]:
+        """Returns a mask that is True for valid (not nodata) pixels."""
+        if self.nodata is None:
+            return np.ones(self.data.shape, dtype=bool)
+        if np.isnan(self.nodata):
+            mask: npt.NDArray[np.bool_] = ~np.isnan(self.data)
+            return mask
+        mask = self.data != self.nodata
+        return mask
+
+
+class GranuleRasters:
+    """Decodes the band COGs of a granule at most once each and shares the
+    arrays between the Fmask and `raster:bands` statistics.
+
+    Each COG is read from the coarsest overview with at least `min_size` rows
+    and columns. Reads are thread-safe, so different bands can be decoded
+    concurrently.
+    """
+
+    def __init__(
+        self,
+        read_href_modifier: Optional[ReadHrefModifier] = None,
+        min_size: int = constants.RASTER_MIN_OVERVIEW_SIZE,
+    ) -> None:
+        self.read_href_modifier = read_href_modifier
+        self.min_size = min_size
+        self._cache: Dict[str, RasterData] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def read(self, href: str) -> RasterData:
+        """Returns the decoded first band of a COG, reading it on first use.
+
+        Args:
+            href (str): HREF to a COG file of the granule.
+
+        Returns:
+            RasterData: The decoded band.
+        """
+        with self._lock:
+            lock = self._locks.setdefault(href, threading.Lock())
+        with lock:
+            if href not in self._cache:
+                self._cache[href] = read_overview(
+                    utils.modify_href(href, self.read_href_modifier), self.min_size
+                )
+            return self._cache[href]
+
+    def map(
+        self,
+        hrefs: List[str],
+        consumer: Callable[[RasterData], T],
+        max_workers: int = constants.RASTER_READ_MAX_WORKERS,
+    ) -> Dict[str, T]:
+        """Reads several COGs concurrently and applies a consumer to each
+        decoded band.
+
+        Args:
+            hrefs (List[str]): HREFs to COG files of the granule.
+            consumer (Callable[[RasterData], T]): Function applied to each
+                decoded band, e.g., `band_statistics`.
+            max_workers (int): Maximum number of threads used to read COGs.
+
+        Returns:
+            Dict[str, T]: Consumer results by HREF.
+        """
+
+        def _consume(href: str) -> T:
+            return consumer(self.read(href))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(hrefs, executor.map(_consume, hrefs)))
+
+
+def select_overview_level(
+    dataset: DatasetReader, min_size: int = constants.RASTER_MIN_OVERVIEW_SIZE
+) -> Optional[int]:
+    """Selects the coarsest overview with at least `min_size` rows and
+    columns.
+
+    Args:
+        dataset (DatasetReader): An open full resolution dataset.
+        min_size (int): Minimum number of rows and columns.
+
+    Returns:
+        Optional[int]: The overview level, or None if no overview is large
+        enough and the full resolution data should be used.
+    """
+    level = None
+    for index, factor in enumerate(dataset.overviews(1)):
+        if min(dataset.height, dataset.width) // factor >= min_size:
+            level = index
+    return level
+
+
+def read_overview(
+    href: str, min_size: int = constants.RASTER_MIN_OVERVIEW_SIZE
+) -> RasterData:
+    """Decodes the first band of a COG from the coarsest overview with at least
+    `min_size` rows and columns.
+
+    Local COGs are opened by path, so GDAL reads them with its native file
+    handler. If no overview is large enough, the full resolution band is read
+    from the already open dataset.
+
+    Args:
+        href (str): HREF to the COG, already modified for reading if needed.
+        min_size (int): Minimum number of rows and columns.
+
+    Returns:
+        RasterData: The decoded band.
+    """
+    path = utils.local_path(href) or href
+    with rasterio.open(path) as dataset:
+        level = select_overview_level(dataset, min_size)
+        if level is None:
+            return _read_band(dataset)
+    with rasterio.open(path, overview_level=level) as dataset:
+        return _read_band(dataset)
+
+
+def _read_band(dataset: DatasetReader) -> RasterData:
+    return RasterData(
+        data=dataset.read(1),
+        nodata=dataset.nodata,
+        transform=dataset.transform,
+        crs=dataset.crs,
+    )
+
+
+def band_statistics(raster: RasterData, histogram: bool = False) -> Dict[str, Any]:
+    """Computes `raster:bands` statistics, and optionally a histogram, for the
+    valid pixels in a decoded band.
+
+    Statistics are computed from the stored pixel values, i.e., before any
+    scale and offset are applied.
+
+    Args:
+        raster (RasterData): The decoded band.
+        histogram (bool): Flag to include a histogram with
+            `HISTOGRAM_BUCKETS` equal-width buckets.
+
+    Returns:
+        Dict[str, Any]: `raster:bands` fields, i.e., `statistics` and
+        optionally `histogram`.
+    """
+    if raster.nodata is None:
+        values = raster.data.reshape(-1)
+    else:
+        values = raster.data[raster.valid_mask()]
+    valid_percent = round(100 * values.size / raster.data.size, 2)
+    if values.size == 0:
+        return {"statistics": {"valid_percent": valid_percent}}
+
+    minimum = values.min().item()
+    maximum = values.max().item()
+    fields: Dict[str, Any] = {
+        "statistics": {
+            "minimum": minimum,
+            "maximum": maximum,
+            "mean": round(float(values.mean(dtype=np.float64)), 4),
+            "stddev": round(float(values.std(dtype=np.float64)), 4),
+            "valid_percent": valid_percent,
+        }
+    }
+    if histogram:
+        buckets, _ = np.histogram(
+            values, bins=constants.HISTOGRAM_BUCKETS, range=(minimum, maximum)
+        )
+        fields["histogram"] = {
+            "count": constants.HISTOGRAM_BUCKETS,
+            "min": minimum,
+            "max": maximum,
+            "buckets": buckets.tolist(),
+        }
+    return fields
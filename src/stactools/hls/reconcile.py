@@ -0,0 +1,79 @@
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+from stactools.hls import utils
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ["latest", "earliest"]
+
+
+class Reconciliation(NamedTuple):
+    """The result of `reconcile_hrefs`.
+
+    `kept` holds the kept HREFs in their input order. `dropped` maps each
+    dropped HREF to the id of the granule that superseded it.
+    """
+
+    kept: List[str]
+    dropped: Dict[str, str]
+
+
+def granule_key(href: str) -> Tuple[str, str, str]:
+    """Returns the product, tile ID, and full sensing time of an HLS file HREF,
+    i.e., every granule id field except the collection version. Granules with
+    the same key are versions of the same acquisition; different acquisitions
+    on the same day, e.g., from overlapping orbits, have different keys."""
+    parsed = utils.parse_href(href)
+    return (parsed.product, parsed.tile_id, parsed.sensing_time)
+
+
+def version_rank(href: str) -> Tuple[int, int, str]:
+    """Returns a sort key that orders versions of the same granule by
+    collection version, then HREF."""
+    parsed = utils.parse_href(href)
+    major, minor = parsed.version[1:].split(".")
+    return (int(major), int(minor), href)
+
+
+def reconcile_hrefs(hrefs: Iterable[str], policy: str = "latest") -> Reconciliation:
+    """Keeps one version of each granule, i.e., one granule for each product,
+    tile, and sensing time.
+
+    Only the HREF file names are used, so superseded granules are never
+    read. Listing the same HREF more than once keeps it once.
+
+    Args:
+        hrefs (Iterable[str]): HREFs to a single COG file for each granule.
+        policy (str): Either 'latest', to keep the highest collection version,
+            or 'earliest', to keep the lowest.
+            Defaults to 'latest'.
+
+    Returns:
+        Reconciliation: The kept and dropped HREFs.
+    """
+    if policy not in POLICIES:
+        raise ValueError(
+            f"Unknown reconciliation policy '{policy}', expected one of {POLICIES}"
+        )
+    choose = max if policy == "latest" else min
+
+    groups: Dict[Tuple[str, str, str], List[str]] = {}
+    order: Dict[str, int] = {}
+    for href in hrefs:
+        if href not in order:
+            order[href] = len(order)
+            groups.setdefault(granule_key(href), []).append(href)
+
+    kept = []
+    dropped = {}
+    for group in groups.values():
+        keep = choose(group, key=version_rank)
+        kept.append(keep)
+        keep_id = utils.id_from_href(keep)
+        for href in group:
+            if href != keep:
+                dropped[href] = keep_id
+                logger.info(f"Dropped {href}, superseded by {keep_id}")
+    kept.sort(key=order.__getitem__)
+    return Reconciliation(kept=kept, dropped=dropped)
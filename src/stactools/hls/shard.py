@@ -0,0 +1,214 @@
+import glob
+import json
+import logging
+import os
+import zlib
+from typing import Any, Dict, Iterable, List, Optional
+
+from pystac import CatalogType, Collection, Link, MediaType
+from pystac.utils import make_absolute_href, make_relative_href
+from stactools.core.io import ReadHrefModifier
+from stactools.core.utils.antimeridian import Strategy
+
+from stactools.hls import stac, utils, writer
+from stactools.hls.aggregate import ItemAggregator
+
+logger = logging.getLogger(__name__)
+
+SHARD_BY = ["hash", "zone"]
+PARTIAL_PATTERN = "partial-*-of-*.json"
+
+
+def shard_index(href: str, num_shards: int, shard_by: str = "hash") -> int:
+    """Deterministically assigns a granule HREF to a shard.
+
+    Args:
+        href (str): HREF to a COG file of an HLS granule.
+        num_shards (int): Total number of shards.
+        shard_by (str): Either 'hash', to spread granules evenly by a hash of
+            the granule id, or 'zone', to keep all granules in an MGRS UTM zone
+            in the same shard. Defaults to 'hash'.
+
+    Returns:
+        int: Zero-based shard index.
+    """
+    if shard_by == "hash":
+        key = utils.id_from_href(href)
+    elif shard_by == "zone":
+        key = utils.tile_id_from_href(href)[1:3]
+    else:
+        raise ValueError(
+            f"Unknown shard strategy '{shard_by}', expected one of {SHARD_BY}"
+        )
+    return zlib.crc32(key.encode("utf-8")) % num_shards
+
+
+def select_shard(
+    hrefs: Iterable[str], shard: int, num_shards: int, shard_by: str = "hash"
+) -> List[str]:
+    """Returns the granule HREFs assigned to a shard.
+
+    Args:
+        hrefs (Iterable[str]): HREFs to a single COG file for each granule.
+        shard (int): Zero-based index of the shard to select.
+        num_shards (int): Total number of shards.
+        shard_by (str): Shard strategy, see `shard_index`. Defaults to 'hash'.
+
+    Returns:
+        List[str]: HREFs in the shard.
+    """
+    if not 0 <= shard < num_shards:
+        raise ValueError(f"Shard {shard} is out of range for {num_shards} shards")
+    return [href for href in hrefs if shard_index(href, num_shards, shard_by) == shard]
+
+
+def create_shard(
+    hrefs: Iterable[str],
+    outdir: str,
+    shard: int,
+    num_shards: int,
+    shard_by: str = "hash",
+    read_href_modifier: Optional[ReadHrefModifier] = None,
+    use_raster_footprint: bool = False,
+    fmask_statistics: bool = False,
+    raster_statistics: bool = False,
+    raster_histograms: bool = False,
+    check_existence: bool = False,
+    antimeridian_strategy: Strategy = Strategy.SPLIT,
+) -> str:
+    """Creates and saves the Items for one shard of a Collection.
+
+    Items are saved in the layout of a self-contained Collection in `outdir`.
+    The extent and summaries of the shard Items, and the Item HREFs, are saved
+    in a partial file for `merge_shards`. The partial file is written
+    atomically, and is written even if no granules are assigned to the shard.
+
+    Args:
+        hrefs (Iterable[str]): HREFs to a single EO COG file for each granule
+            in the full Collection. Only those assigned to `shard` are used.
+        outdir (str): Directory that will contain the Collection.
+        shard (int): Zero-based index of the shard to create.
+        num_shards (int): Total number of shards.
+        shard_by (str): Shard strategy, see `shard_index`. Defaults to 'hash'.
+        read_href_modifier (ReadHrefModifier, optional): An optional
+            function to modify the href (e.g. to add a token to a url)
+        use_raster_footprint (bool): Flag to use stactools raster_footprint
+            for the Item geometry rather than the boundary in the XML metadata
+            file.
+        fmask_statistics (bool, optional): Flag to add Fmask statistics to the
+            Items. Defaults to False.
+        raster_statistics (bool, optional): Flag to add `raster:bands`
+            statistics to the Items. Defaults to False.
+        raster_histograms (bool, optional): Flag to also add `raster:bands`
+            histograms to the Items. Defaults to False.
+        check_existence (bool, optional): Flag to check that COGs exist for all
+            granule assets. Defaults to False.
+        antimeridian_strategy (Strategy, optional): Choice of 'normalize' or
+            'split' to either split the Item geometry on -180 longitude or
+            normalize the Item geometry so all longitudes are either positive or
+            negative. Default is 'split'.
+
+    Returns:
+        str: HREF of the partial file.
+    """
+    os.makedirs(outdir, exist_ok=True)
+    collection = stac.create_collection()
+    collection.set_self_href(os.path.join(outdir, "collection.json"))
+    collection.catalog_type = CatalogType.SELF_CONTAINED
+
+    aggregator = ItemAggregator()
+    item_hrefs = []
+    for href in select_shard(hrefs, shard, num_shards, shard_by):
+        item = stac.create_item(
+            href,
+            read_href_modifier=read_href_modifier,
+            use_raster_footprint=use_raster_footprint,
+            fmask_statistics=fmask_statistics,
+            raster_statistics=raster_statistics,
+            raster_histograms=raster_histograms,
+            check_existence=check_existence,
+            antimeridian_strategy=antimeridian_strategy,
+        )
+        collection.add_item(item)
+        item.make_asset_hrefs_relative()
+        # Written atomically, so an interrupted shard never leaves a
+        # truncated Item for merge_shards to link
+        os.makedirs(os.path.dirname(item.self_href), exist_ok=True)
+        writer.write_json(
+            item.self_href, writer.dumps(item.to_dict(include_self_link=False))
+        )
+        aggregator.add_item(item)
+        item_hrefs.append(make_relative_href(item.self_href, collection.self_href))
+        collection.remove_item(item.id)
+        logger.debug(f"Saved {item.id} in shard {shard}")
+
+    partial = {
+        "shard": shard,
+        "num_shards": num_shards,
+        "aggregate": aggregator.to_dict(),
+        "items": item_hrefs,
+    }
+    partial_href = os.path.join(outdir, f"partial-{shard}-of-{num_shards}.json")
+    writer.write_json(partial_href, json.dumps(partial).encode("utf-8"))
+    return partial_href
+
+
+def merge_shards(outdir: str, remove_partials: bool = True) -> Collection:
+    """Creates the Collection for shards saved in `outdir` by `create_shard`.
+
+    The Collection extent, summaries, and Item links are created from the
+    partial files; no Items are read.
+
+    Args:
+        outdir (str): Directory containing the shard Items and partial files.
+        remove_partials (bool): Flag to delete the partial files after the
+            Collection is saved. Defaults to True.
+
+    Returns:
+        Collection: The saved, self-contained Collection.
+    """
+    partial_hrefs = sorted(glob.glob(os.path.join(outdir, PARTIAL_PATTERN)))
+    partials: List[Dict[str, Any]] = []
+    for partial_href in partial_hrefs:
+        with open(partial_href) as f:
+            partials.append(json.load(f))
+    _check_partials(partials, outdir)
+
+    collection = stac.create_collection()
+    collection.set_self_href(os.path.join(outdir, "collection.json"))
+    collection.catalog_type = CatalogType.SELF_CONTAINED
+
+    aggregator = ItemAggregator()
+    item_hrefs = []
+    for partial in partials:
+        aggregator.merge(ItemAggregator.from_dict(partial["aggregate"]))
+        item_hrefs.extend(partial["items"])
+    aggregator.update_collection(collection)
+
+    for item_href in sorted(item_hrefs):
+        collection.add_link(
+            Link(
+                "item",
+                make_absolute_href(item_href, collection.self_href),
+                media_type=MediaType.GEOJSON,
+            )
+        )
+    collection.save_object(include_self_link=False)
+
+    if remove_partials:
+        for partial_href in partial_hrefs:
+            os.remove(partial_href)
+
+    return collection
+
+
+def _check_partials(partials: List[Dict[str, Any]], outdir: str) -> None:
+    if not partials:
+        raise FileNotFoundError(f"No shard partial files found in {outdir}")
+    num_shards = {partial["num_shards"] for partial in partials}
+    if len(num_shards) > 1:
+        raise ValueError(f"Partial files in {outdir} are from different shard runs")
+    expected = set(range(num_shards.pop()))
+    missing = expected - {partial["shard"] for partial in partials}
+    if missing:
+        raise ValueError(f"Missing partial files for shards {sorted(missing)}")
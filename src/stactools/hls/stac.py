@@ -8,6 +8,7 @@ from pystac.extensions.projection import ProjectionExtension
 from pystac.extensions.raster import RasterExtension
 from pystac.extensions.scientific import ScientificExtension
 from pystac.extensions.view import ViewExtension
+from pystac.utils import datetime_to_str
 from shapely.geometry import MultiPolygon, shape
 from stactools.core.geometry import bounding_box
 from stactools.core.io import ReadHrefModifier
@@ -22,7 +23,7 @@ from stactools.hls.constants import (
     SCIENTIFIC,
 )
 from stactools.hls.fragments import STACFragments
-from stactools.hls.metadata import hls_metadata
+from stactools.hls.metadata import GranuleRecord, hls_metadata
 
 
 def create_item(
@@ -31,6 +32,9 @@ def create_item(
     use_raster_footprint: bool = False,
     check_existence: bool = False,
     antimeridian_strategy: Strategy = Strategy.SPLIT,
+    fmask_statistics: bool = False,
+    raster_statistics: bool = False,
+    raster_histograms: bool = False,
 ) -> Item:
     """Creates a STAC Item for an HLS granule.
 
@@ -47,22 +51,106 @@ def create_item(
             'split' to either split the Item geometry on -180 longitude or
             normalize the Item geometry so all longitudes are either positive or
             negative. Default is 'split'.
+        fmask_statistics (bool, optional): Flag to add cloud, cloud shadow,
+            snow/ice, water, and valid data percentages computed from an
+            overview of the Fmask COG. Defaults to False.
+        raster_statistics (bool, optional): Flag to add `raster:bands`
+            statistics computed from overviews of every asset COG. The COGs
+            are read concurrently. Defaults to False.
+        raster_histograms (bool, optional): Flag to also add `raster:bands`
+            histograms. Implies `raster_statistics`. Defaults to False.
 
     Returns:
         Item: An HLS STAC Item.
     """
+    record = create_granule_record(
+        cog_href,
+        read_href_modifier,
+        use_raster_footprint,
+        fmask_statistics,
+        raster_statistics,
+        raster_histograms,
+    )
+    return create_item_from_record(
+        record,
+        read_href_modifier=read_href_modifier,
+        check_existence=check_existence,
+        antimeridian_strategy=antimeridian_strategy,
+    )
+
+
+def create_granule_record(
+    cog_href: str,
+    read_href_modifier: Optional[ReadHrefModifier] = None,
+    use_raster_footprint: bool = False,
+    fmask_statistics: bool = False,
+    raster_statistics: bool = False,
+    raster_histograms: bool = False,
+) -> GranuleRecord:
+    """Reads the metadata for an HLS granule into a compact, picklable record.
+
+    This is the I/O-bound half of `create_item`. The returned record can be
+    passed to `create_item_from_record`, e.g., in another process.
+
+    Args:
+        cog_href (str): HREF to one of the EO COG files in the granule.
+        read_href_modifier (ReadHrefModifier, optional): An optional
+            function to modify the href (e.g. to add a token to a url)
+        use_raster_footprint (bool): Flag to use stactools raster_footprint
+            for the record geometry rather than the boundary in the XML
+            metadata file.
+        fmask_statistics (bool, optional): Flag to compute cloud, cloud shadow,
+            snow/ice, water, and valid data percentages from an overview of the
+            Fmask COG. Defaults to False.
+        raster_statistics (bool, optional): Flag to compute `raster:bands`
+            statistics from overviews of every asset COG. Defaults to False.
+        raster_histograms (bool, optional): Flag to also compute
+            `raster:bands` histograms. Defaults to False.
+
+    Returns:
+        GranuleRecord: Record of the granule Item fields.
+    """
     metadata = hls_metadata(cog_href, read_href_modifier)
+    return metadata.to_record(
+        use_raster_footprint, fmask_statistics, raster_statistics, raster_histograms
+    )
+
+
+def create_item_from_record(
+    record: GranuleRecord,
+    read_href_modifier: Optional[ReadHrefModifier] = None,
+    check_existence: bool = False,
+    antimeridian_strategy: Strategy = Strategy.SPLIT,
+) -> Item:
+    """Creates a STAC Item for an HLS granule from a granule record.
+
+    No granule files are read unless `check_existence` is True.
+
+    Args:
+        record (GranuleRecord): Record of the granule Item fields.
+        read_href_modifier (ReadHrefModifier, optional): An optional
+            function to modify the href (e.g. to add a token to a url) for use
+            in checking COG existence.
+        check_existence (bool, optional): Flag to check that COGs exist for all
+                granule assets. Defaults to False.
+        antimeridian_strategy (Strategy, optional):Choice of 'normalize' or
+            'split' to either split the Item geometry on -180 longitude or
+            normalize the Item geometry so all longitudes are either positive or
+            negative. Default is 'split'.
+
+    Returns:
+        Item: An HLS STAC Item.
+    """
     fragments = STACFragments()
 
-    id = utils.id_from_href(cog_href)
-    product = utils.product_from_href(cog_href)
-    geometry = metadata.geometry(use_raster_footprint)
+    product = record.product
+    geometry = record.geometry
 
     item = Item(
-        id=id,
+        id=record.id,
         geometry=geometry,
         bbox=bounding_box(geometry),
-        datetime=metadata.acquisition_datetime,
+        datetime=record.acquisition_datetime,
         properties={
             "sci:doi": SCIENTIFIC[product]["doi"],
             "hls:product": f"HLS{product}",
@@ -70,35 +158,42 @@ def create_item(
     )
 
     cog_hrefs = utils.create_cog_hrefs(
-        cog_href,
+        record.cog_href,
         product,
         check_existence,
         read_href_modifier,
     )
     for href in cog_hrefs:
         asset_key, asset_dict = fragments.asset(href)
+        if record.raster_statistics:
+            band_name = utils.band_name_from_href(href)
+            asset_dict["raster:bands"][0].update(record.raster_statistics[band_name])
         item.add_asset(asset_key, Asset.from_dict(asset_dict))
 
-    if metadata.start_end_datetime:
-        item.properties.update(**metadata.start_end_datetime)
+    if record.start_datetime and record.end_datetime:
+        item.properties["start_datetime"] = datetime_to_str(record.start_datetime)
+        item.properties["end_datetime"] = datetime_to_str(record.end_datetime)
     item.common_metadata.created = datetime.now(tz=timezone.utc)
-    item.common_metadata.platform = metadata.platform
+    item.common_metadata.platform = record.platform
     item.common_metadata.instruments = INSTRUMENT[product]
 
     eo = EOExtension.ext(item, add_if_missing=True)
-    eo.cloud_cover = metadata.cloud_cover
+    eo.cloud_cover = record.cloud_cover
 
     view = ViewExtension.ext(item, add_if_missing=True)
-    view.azimuth = metadata.azimuth
-    view.sun_azimuth = metadata.sun_azimuth
+    view.azimuth = record.azimuth
+    view.sun_azimuth = record.sun_azimuth
 
     proj = ProjectionExtension.ext(item, add_if_missing=True)
-    proj.epsg = metadata.epsg
-    proj.shape = metadata.shape
-    proj.transform = metadata.transform
+    proj.epsg = record.epsg
+    proj.shape = list(record.shape)
+    proj.transform = list(record.transform)
 
     item.stac_extensions.append(MGRS_EXTENSION_HREF)
-    item.properties.update(**metadata.mgrs)
+    item.properties.update(**record.mgrs)
+
+    if record.fmask_statistics:
+        item.properties.update(**record.fmask_statistics)
 
     RasterExtension.add_to(item)
 
@@ -0,0 +1,178 @@
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from pystac import Catalog, CatalogType, Collection, Link
+from pystac.layout import BestPracticesLayoutStrategy
+from stactools.core.io import ReadHrefModifier
+from stactools.core.utils.antimeridian import Strategy
+
+from stactools.hls import layout, stac, writer
+from stactools.hls.aggregate import ItemAggregator
+
+logger = logging.getLogger(__name__)
+
+# Item properties that differ every time an unchanged granule is processed
+TIMESTAMP_PROPERTIES = ["created", "updated"]
+
+
+class CollectionUpdate(NamedTuple):
+    """The result of `update_collection`.
+
+    `added`, `replaced`, and `unchanged` hold Item ids. `files_written` is the
+    number of Item and Collection files written.
+    """
+
+    collection: Collection
+    added: List[str]
+    replaced: List[str]
+    unchanged: List[str]
+    files_written: int
+
+
+def update_collection(
+    collection_href: str,
+    hrefs: Iterable[str],
+    layout_name: str = "flat",
+    read_href_modifier: Optional[ReadHrefModifier] = None,
+    use_raster_footprint: bool = False,
+    fmask_statistics: bool = False,
+    raster_statistics: bool = False,
+    raster_histograms: bool = False,
+    check_existence: bool = False,
+    antimeridian_strategy: Strategy = Strategy.SPLIT,
+) -> CollectionUpdate:
+    """Adds new Items to, and replaces changed Items in, an existing
+    self-contained Collection.
+
+    Existing Items are not read unless a new Item has the same HREF, i.e., the
+    same granule id. Such an Item replaces the existing Item only if its
+    content, other than the `created` and `updated` timestamps, differs; it
+    keeps the existing `created` timestamp and gets a new `updated` timestamp.
+    The extent and summaries are grown from the new Items without reading the
+    existing Items, so they never shrink. For the 'tile-time' layout, only the
+    child Collections that new Items belong to are read.
+
+    Only the Items and Collections whose content changed are written, so the
+    cost of an update is proportional to the number of new and changed
+    granules, plus the size of the link lists of the Collections they belong
+    to.
+
+    Args:
+        collection_href (str): HREF of the Collection file.
+        hrefs (Iterable[str]): HREFs to a single EO COG file for each new or
+            changed granule.
+        layout_name (str): The layout used to create the Collection, either
+            'flat' or 'tile-time'. Defaults to 'flat'.
+        read_href_modifier (ReadHrefModifier, optional): An optional
+            function to modify the href (e.g. to add a token to a url)
+        use_raster_footprint (bool): Flag to use stactools raster_footprint
+            for the Item geometry rather than the boundary in the XML metadata
+            file.
+        fmask_statistics (bool, optional): Flag to add Fmask statistics to the
+            Items. Defaults to False.
+        raster_statistics (bool, optional): Flag to add `raster:bands`
+            statistics to the Items. Defaults to False.
+        raster_histograms (bool, optional): Flag to also add `raster:bands`
+            histograms to the Items. Defaults to False.
+        check_existence (bool, optional): Flag to check that COGs exist for all
+            granule assets. Defaults to False.
+        antimeridian_strategy (Strategy, optional): Choice of 'normalize' or
+            'split' to either split the Item geometry on -180 longitude or
+            normalize the Item geometry so all longitudes are either positive or
+            negative. Default is 'split'.
+
+    Returns:
+        CollectionUpdate: The updated Collection and the ids of the added,
+        replaced, and unchanged Items.
+    """
+    collection = Collection.from_file(collection_href)
+    collection.catalog_type = CatalogType.SELF_CONTAINED
+    aggregator = ItemAggregator.from_collection(collection)
+    item_layout = layout.get_layout(layout_name, collection)
+    strategy = BestPracticesLayoutStrategy()
+    item_links: Dict[str, Dict[Optional[str], Link]] = {}
+
+    added = []
+    replaced = []
+    unchanged = []
+    for href in dict.fromkeys(hrefs):
+        item = stac.create_item(
+            href,
+            read_href_modifier=read_href_modifier,
+            use_raster_footprint=use_raster_footprint,
+            fmask_statistics=fmask_statistics,
+            raster_statistics=raster_statistics,
+            raster_histograms=raster_histograms,
+            check_existence=check_existence,
+            antimeridian_strategy=antimeridian_strategy,
+        )
+        parent = item_layout.parent(item)
+        parent_href = parent.get_self_href()
+        assert parent_href is not None
+        if parent.id not in item_links:
+            item_links[parent.id] = _unresolved_item_links(parent)
+        item_href = strategy.get_href(item, parent_href)
+        existing_link = item_links[parent.id].pop(item_href, None)
+
+        if existing_link is None:
+            aggregator.add_item(item)
+            item_layout.add_item(item)
+            item.make_asset_hrefs_relative()
+            added.append(item.id)
+            logger.debug(f"Added {item.id}")
+            continue
+
+        link = item_layout.add_item(item, count=False)
+        item.make_asset_hrefs_relative()
+        existing = writer.read_json(item_href)
+        if existing is not None:
+            created = existing["properties"].get("created")
+            if created is not None:
+                item.properties["created"] = created
+            if _content(existing) == _content(item.to_dict(include_self_link=False)):
+                parent.links.remove(link)
+                unchanged.append(item.id)
+                logger.debug(f"Unchanged {item.id}")
+                continue
+
+        item.common_metadata.updated = datetime.now(tz=timezone.utc)
+        aggregator.add_item(item, count=False)
+        # Keep the link in place so the parent link list is unchanged
+        parent.links.remove(link)
+        parent.links[parent.links.index(existing_link)] = link
+        replaced.append(item.id)
+        logger.debug(f"Replaced {item.id}")
+
+    aggregator.update_collection(collection)
+    item_layout.finalize()
+    files_written = writer.save_catalog(collection, skip_unchanged=True)
+    logger.info(
+        f"Added {len(added)}, replaced {len(replaced)}, and skipped "
+        f"{len(unchanged)} unchanged Items; wrote {files_written} files"
+    )
+    return CollectionUpdate(
+        collection=collection,
+        added=added,
+        replaced=replaced,
+        unchanged=unchanged,
+        files_written=files_written,
+    )
+
+
+def _unresolved_item_links(parent: Catalog) -> Dict[Optional[str], Link]:
+    return {
+        link.get_absolute_href(): link
+        for link in parent.get_item_links()
+        if not link.is_resolved()
+    }
+
+
+def _content(d: Dict[str, Any]) -> Dict[str, Any]:
+    content: Dict[str, Any] = json.loads(writer.dumps(d))
+    for key in TIMESTAMP_PROPERTIES:
+        content["properties"].pop(key, None)
+    # pystac may order the parent and collection links either way
+    content["links"].sort(key=lambda link: (link["rel"], link["href"]))
+    return content
@@ -1,7 +1,15 @@
+import calendar
+import mmap
 import os
-from typing import List, Optional
+import re
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Iterator, List, NamedTuple, Optional, Union
+from urllib.parse import unquote, urlparse, urlsplit, urlunsplit
 
 import shapely.ops
+from dateutil.parser import parse
 from pystac import Item
 from shapely.geometry import MultiPolygon, Polygon, mapping, shape
 from stactools.core.io import ReadHrefModifier
@@ -14,6 +22,69 @@ class UnsupportedProduct(Exception):
     """Product is not supported by this stactools package"""
 
 
+class InvalidHref(ValueError):
+    """An HREF does not point to a file with an HLS granule file name.
+
+    Attributes:
+        href (str): The invalid HREF.
+        field (Optional[str]): The first file name field that is missing or
+            malformed, e.g., 'tile_id', or None if the file name does not have
+            the expected number of fields.
+        value (Optional[str]): The malformed field value.
+    """
+
+    def __init__(
+        self, href: str, field: Optional[str] = None, value: Optional[str] = None
+    ) -> None:
+        self.href = href
+        self.field = field
+        self.value = value
+        if field is None:
+            reason = (
+                "expected a file name like "
+                "'HLS.L30.T19LDD.2022165T144027.v2.0.B01.tif'"
+            )
+        else:
+            reason = f"invalid {field} '{value}'"
+        super().__init__(f"Invalid HLS HREF '{href}': {reason}")
+
+
+HLS_DATETIME_PATTERN = re.compile(
+    r"\s*(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?Z\s*$"
+)
+
+
+def parse_hls_datetime(value: str) -> datetime:
+    """Parses an HLS COG tag timestamp, e.g., '2022-06-14T14:40:27.6783440Z'.
+
+    The SENSING_TIME and HLS_PROCESSING_TIME tags use a fixed UTC format that
+    is parsed directly. Any other format falls back to the (much slower)
+    dateutil parser.
+
+    Args:
+        value (str): Timestamp string from an HLS COG tag.
+
+    Returns:
+        datetime: The parsed timestamp.
+    """
+    match = HLS_DATETIME_PATTERN.match(value)
+    if match is None:
+        t: datetime = parse(value)
+        return t
+    year, month, day, hour, minute, second, fraction = match.groups()
+    microsecond = int(fraction[:6].ljust(6, "0")) if fraction else 0
+    return datetime(
+        int(year),
+        int(month),
+        int(day),
+        int(hour),
+        int(minute),
+        int(second),
+        microsecond,
+        tzinfo=timezone.utc,
+    )
+
+
 def modify_href(
     href: str, read_href_modifier: Optional[ReadHrefModifier] = None
 ) -> str:
@@ -33,6 +104,63 @@ def modify_href(
         return href
 
 
+def local_path(href: str) -> Optional[str]:
+    """Returns the local file system path for an HREF, or None if the HREF is
+    not local (e.g., an http or cloud storage URL). The path of a file URI is
+    percent-decoded.
+
+    Args:
+        href (str): The HREF to check.
+
+    Returns:
+        Optional[str]: Local file system path, or None.
+    """
+    parsed = urlparse(href)
+    if parsed.scheme == "file":
+        return unquote(parsed.path)
+    if parsed.scheme == "" or (len(parsed.scheme) == 1 and os.name == "nt"):
+        return href
+    return None
+
+
+def exists(href: str) -> bool:
+    """Checks that a file exists. Local files are checked with a single
+    file system call rather than through fsspec.
+
+    Args:
+        href (str): HREF to the file, already modified for reading if needed.
+
+    Returns:
+        bool: True if the file exists.
+    """
+    path = local_path(href)
+    if path is None:
+        return bool(href_exists(href))
+    return os.path.isfile(path)
+
+
+@contextmanager
+def map_file(path: str) -> Iterator[Union[mmap.mmap, bytes]]:
+    """Memory-maps a local file read-only.
+
+    The mapped buffer can be passed to parsers that accept bytes-like objects
+    without first copying the file into memory. An empty file, which cannot
+    be mapped, is returned as empty bytes.
+
+    Args:
+        path (str): Local file system path.
+
+    Returns:
+        Iterator[Union[mmap.mmap, bytes]]: The mapped file contents.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
 def create_cog_hrefs(
     href: str,
     product: str,
@@ -54,52 +182,178 @@ def create_cog_hrefs(
     Returns:
         List[str]: List of granule COG hrefs.
     """
-    base_href, filename = os.path.split(href)
-    base_filename = ".".join(filename.split(".")[:-2])
-
     cog_hrefs = []
     for band in constants.BANDS[product]:
-        cog_hrefs.append(f"{base_href}/{base_filename}.{band}.tif")
+        cog_hrefs.append(band_href(href, band))
     for common_band in constants.BANDS["common"]:
-        cog_hrefs.append(f"{base_href}/{base_filename}.{common_band}.tif")
+        cog_hrefs.append(band_href(href, common_band))
 
     if check_existence:
         for cog_href in cog_hrefs:
             read_href = modify_href(cog_href, read_href_modifier=read_href_modifier)
-            if not href_exists(read_href):
+            if not exists(read_href):
                 raise ValueError(f"File not found: {cog_href}")
 
     return cog_hrefs
 
 
+HLS_FILENAME_PATTERN = re.compile(
+    r"(?P<granule_id>HLS\.(?P<product>[LS]30)"
+    r"\.(?P<tile_id>T(?P<utm_zone>\d{2})(?P<latitude_band>[C-X])"
+    r"(?P<grid_square>[A-Z]{2}))"
+    r"\.(?P<sensing_time>\d{7}T\d{6})\.(?P<version>v\d+\.\d+))"
+    r"\.(?P<band>\w+)\.(?P<extension>\w+)"
+)
+
+HLS_FILENAME_FIELDS = {
+    "prefix": re.compile(r"HLS"),
+    "product": re.compile(r"[LS]30"),
+    "tile_id": re.compile(r"T\d{2}[C-X][A-Z]{2}"),
+    "sensing_time": re.compile(r"\d{7}T\d{6}"),
+    "version": re.compile(r"v\d+\.\d+"),
+    "band": re.compile(r"\w+"),
+    "extension": re.compile(r"\w+"),
+}
+
+
+class HlsHref(NamedTuple):
+    """The fields of an HLS granule file HREF, parsed once.
+
+    Use `parse_href` to create instances, e.g., for
+    `.../HLS.L30.T19LDD.2022165T144027.v2.0.B01.tif`: product 'L30', tile_id
+    'T19LDD', sensing_time '2022165T144027', version 'v2.0', and band 'B01'.
+    """
+
+    href: str
+    granule_id: str
+    product: str
+    tile_id: str
+    utm_zone: int
+    latitude_band: str
+    grid_square: str
+    sensing_time: str
+    version: str
+    band: str
+    extension: str
+
+
+@lru_cache(maxsize=constants.HREF_CACHE_SIZE)
+def parse_href(href: str) -> HlsHref:
+    """Parses an HLS granule file HREF with a single regular expression match.
+
+    Results are cached by HREF, so the helpers below can be called repeatedly
+    for the same file without re-parsing it.
+
+    A URL query or fragment, e.g., the signature of a pre-signed URL, is
+    ignored.
+
+    Args:
+        href (str): HREF to an HLS granule file, e.g., a COG or the CMR XML.
+
+    Returns:
+        HlsHref: The parsed HREF fields.
+
+    Raises:
+        InvalidHref: If the file name is not an HLS granule file name, or its
+            sensing time is not a valid date and time. The first malformed
+            field is identified.
+    """
+    filename = os.path.basename(urlsplit(href).path)
+    match = HLS_FILENAME_PATTERN.fullmatch(filename)
+    if match is None:
+        raise _invalid_href(href, filename)
+    granule_id, product, tile_id, utm_zone, *fields = match.groups()
+    parsed = HlsHref(href, granule_id, product, tile_id, int(utm_zone), *fields)
+    if not _is_valid_sensing_time(parsed.sensing_time):
+        raise InvalidHref(href, "sensing_time", parsed.sensing_time)
+    return parsed
+
+
+def _is_valid_sensing_time(value: str) -> bool:
+    # YYYYDDDTHHMMSS, with a day of the year that exists in the year
+    year, day = int(value[:4]), int(value[4:7])
+    hour, minute, second = int(value[8:10]), int(value[10:12]), int(value[12:14])
+    days = 366 if calendar.isleap(year) else 365
+    return 1 <= day <= days and hour < 24 and minute < 60 and second < 60
+
+
+def _invalid_href(href: str, filename: str) -> InvalidHref:
+    parts = filename.split(".")
+    if len(parts) != 8:
+        return InvalidHref(href)
+    values = parts[:4] + [".".join(parts[4:6])] + parts[6:]
+    for (field, pattern), value in zip(HLS_FILENAME_FIELDS.items(), values):
+        if pattern.fullmatch(value) is None:
+            return InvalidHref(href, field, value)
+    return InvalidHref(href)  # pragma: no cover
+
+
+def _without_query(href: str) -> str:
+    if "?" not in href and "#" not in href:
+        return href
+    return urlunsplit(urlsplit(href)._replace(query="", fragment=""))
+
+
+def band_href(href: str, band: str) -> str:
+    """Creates the HREF to a band COG from any COG HREF in the same granule.
+
+    A URL query or fragment is not carried over, since a pre-signed URL is
+    only valid for the file it was signed for.
+
+    Args:
+        href (str): A COG href belonging to an HLS granule.
+        band (str): The band name, e.g., 'B01' or 'Fmask'.
+
+    Returns:
+        str: HREF to the band COG.
+    """
+    base_href, filename = os.path.split(_without_query(href))
+    base_filename = ".".join(filename.split(".")[:-2])
+    return f"{base_href}/{base_filename}.{band}.tif"
+
+
+def cmr_xml_href(href: str) -> str:
+    """Creates the HREF to the CMR XML metadata file from any COG HREF in the
+    same granule. A URL query or fragment is not carried over.
+
+    Args:
+        href (str): A COG href belonging to an HLS granule.
+
+    Returns:
+        str: HREF to the CMR XML metadata file.
+    """
+    parts = _without_query(href).split(".")[:-2]
+    return f"{'.'.join(parts)}.cmr.xml"
+
+
 def filename_parts(href: str) -> List[str]:
     """Splits the filename from an HLS COG file HREF into a list of its parts."""
-    return os.path.splitext(os.path.basename(href))[0].split(".")
+    return os.path.splitext(os.path.basename(urlsplit(href).path))[0].split(".")
 
 
 def id_from_href(href: str) -> str:
     """Extracts the HLS granule id from an HLS COG file HREF."""
-    return ".".join(filename_parts(href)[:-1])
+    return parse_href(href).granule_id
 
 
 def product_from_href(href: str) -> str:
     """Extracts the HLS product (L30 or S30) from an HLS COG file HREF."""
-    return filename_parts(href)[1]
+    return parse_href(href).product
 
 
 def tile_id_from_href(href: str) -> str:
     """Extracts the HLS tile ID from an HLS COG file HREF."""
-    return filename_parts(href)[2]
+    return parse_href(href).tile_id
 
 
 def version_from_href(href: str) -> str:
     """Extracts the HLS version from an HLS COG file HREF."""
-    return ".".join(filename_parts(href)[4:6])
+    return parse_href(href).version
 
 
 def band_name_from_href(href: str) -> str:
     """Extracts the band name from an HLS COG file HREF."""
-    return filename_parts(href)[-1]
+    return parse_href(href).band
 
 
 def merge_multipolygon(item: Item) -> Item:
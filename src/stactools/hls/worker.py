@@ -0,0 +1,312 @@
+import logging
+import os
+import queue
+import statistics
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterator, NamedTuple, Optional, TextIO
+
+from pystac import Item
+
+from stactools.hls import stac, writer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_POLL_INTERVAL = 1.0
+# Number of recent Item latencies kept for the metrics summary
+LATENCY_WINDOW = 10000
+
+# Defaults for GDAL network reads in a long-running process. Existing
+# environment settings take precedence.
+GDAL_WORKER_OPTIONS = {
+    "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+    "GDAL_HTTP_MERGE_CONSECUTIVE_RANGES": "YES",
+    "GDAL_HTTP_MULTIPLEX": "YES",
+    "VSI_CACHE": "TRUE",
+}
+
+
+class Message(NamedTuple):
+    """A granule HREF received from a queue source.
+
+    `receipt` is whatever the source needs to acknowledge the message, e.g., a
+    spool file path or a queue receipt handle.
+    """
+
+    href: str
+    receipt: Any = None
+
+
+class QueueSource(ABC):
+    """Source of granule HREFs for a `Worker`.
+
+    Implement `receive`, and optionally `ack` and `fail`, to adapt a message
+    queue. `receive` should block until messages are available and return
+    when `stop` is set or the source is exhausted.
+    """
+
+    @abstractmethod
+    def receive(self, stop: threading.Event) -> Iterator[Message]:
+        """Yields messages until the source is exhausted or `stop` is set."""
+        pass
+
+    def ack(self, message: Message) -> None:
+        """Marks a message as processed."""
+        pass
+
+    def fail(self, message: Message) -> None:
+        """Marks a message as failed."""
+        pass
+
+
+class StreamSource(QueueSource):
+    """Reads one granule HREF per line from a text stream, e.g., stdin.
+
+    The stream is read in a daemon thread, so `receive` notices `stop` within
+    `poll_interval` seconds even while waiting for input. Lines that have
+    already been read when `stop` is set are still yielded.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        self.stream = stream or sys.stdin
+        self.poll_interval = poll_interval
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=1)
+        self._reader: Optional[threading.Thread] = None
+
+    def receive(self, stop: threading.Event) -> Iterator[Message]:
+        if self._reader is None:
+            self._reader = threading.Thread(target=self._read, daemon=True)
+            self._reader.start()
+        while not stop.is_set():
+            try:
+                line = self._lines.get(timeout=self.poll_interval)
+            except queue.Empty:
+                continue
+            if line is None:
+                return
+            yield from self._message(line)
+        # Do not drop a line that was read before stopping
+        try:
+            line = self._lines.get_nowait()
+        except queue.Empty:
+            return
+        if line is not None:
+            yield from self._message(line)
+
+    def _read(self) -> None:
+        for line in self.stream:
+            self._lines.put(line)
+        self._lines.put(None)
+
+    def _message(self, line: str) -> Iterator[Message]:
+        href = line.strip()
+        if href:
+            yield Message(href)
+
+
+class SpoolSource(QueueSource):
+    """Reads granule HREFs from files dropped in a spool directory.
+
+    Each file holds one granule HREF. A file is claimed by moving it to the
+    `processing` subdirectory, is deleted once its Item is written, and is
+    moved to the `failed` subdirectory if Item creation fails. Files whose
+    names start with '.' are ignored, so writers can create a hidden file and
+    rename it into place. Several workers can share a spool directory. Files
+    left in `processing` by an interrupted worker are not retried.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        exit_when_empty: bool = False,
+    ) -> None:
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.exit_when_empty = exit_when_empty
+        self.processing = os.path.join(directory, "processing")
+        self.failed = os.path.join(directory, "failed")
+        os.makedirs(self.processing, exist_ok=True)
+        os.makedirs(self.failed, exist_ok=True)
+
+    def receive(self, stop: threading.Event) -> Iterator[Message]:
+        while not stop.is_set():
+            names = sorted(
+                entry.name
+                for entry in os.scandir(self.directory)
+                if entry.is_file() and not entry.name.startswith(".")
+            )
+            for name in names:
+                message = self._claim(name)
+                if message is not None:
+                    yield message
+            if not names:
+                if self.exit_when_empty:
+                    return
+                stop.wait(self.poll_interval)
+
+    def ack(self, message: Message) -> None:
+        os.remove(message.receipt)
+
+    def fail(self, message: Message) -> None:
+        os.replace(
+            message.receipt,
+            os.path.join(self.failed, os.path.basename(message.receipt)),
+        )
+
+    def _claim(self, name: str) -> Optional[Message]:
+        path = os.path.join(self.processing, name)
+        try:
+            os.replace(os.path.join(self.directory, name), path)
+        except FileNotFoundError:
+            # Claimed by another worker
+            return None
+        with open(path) as f:
+            href = f.read().strip()
+        return Message(href, receipt=path)
+
+
+class ItemSink(ABC):
+    """Destination for the Items created by a `Worker`. Must be thread-safe."""
+
+    @abstractmethod
+    def write(self, item: Item) -> None:
+        """Writes an Item."""
+        pass
+
+
+class DirectorySink(ItemSink):
+    """Writes each Item to `{outdir}/{item.id}.json` with relative asset
+    HREFs, as `create-item` does. Files are replaced atomically."""
+
+    def __init__(self, outdir: str) -> None:
+        self.outdir = outdir
+        writer.make_dirs([os.path.join(outdir, "item.json")])
+
+    def write(self, item: Item) -> None:
+        item.set_self_href(os.path.join(self.outdir, f"{item.id}.json"))
+        item.make_asset_hrefs_relative()
+        writer.write_json(
+            item.self_href, writer.dumps(item.to_dict(include_self_link=False))
+        )
+
+
+class WorkerMetrics:
+    """Thread-safe counts and per-Item latencies of a `Worker`.
+
+    Only the latest `window` latencies are kept, so memory use does not grow
+    in a long-running worker.
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.created = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self.latencies.append(latency)
+            self.created += 1
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failed += 1
+
+    def summary(self) -> Dict[str, float]:
+        """Returns the number of created and failed Items and the mean, median,
+        95th percentile, and maximum latency in seconds of the latest Items."""
+        with self._lock:
+            latencies = sorted(self.latencies)
+            created = self.created
+            failed = self.failed
+        summary: Dict[str, float] = {"created": created, "failed": failed}
+        if latencies:
+            summary.update(
+                mean=statistics.fmean(latencies),
+                p50=latencies[len(latencies) // 2],
+                p95=latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                max=latencies[-1],
+            )
+        return summary
+
+
+class Worker:
+    """Long-running Item creation from a queue of granule HREFs.
+
+    Granules are processed concurrently by a thread pool. The process stays
+    warm between granules: asset fragment templates, parsed HREFs, fsspec
+    filesystems, and GDAL's HTTP connections and block cache are reused. At
+    most `2 * max_workers` messages are received ahead of processing.
+    """
+
+    def __init__(
+        self,
+        source: QueueSource,
+        sink: ItemSink,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        **item_options: Any,
+    ) -> None:
+        """
+        Args:
+            source (QueueSource): Source of granule HREFs.
+            sink (ItemSink): Destination for the created Items.
+            max_workers (int): Number of granules processed concurrently.
+            **item_options: Keyword arguments for `stac.create_item`, e.g.,
+                `use_raster_footprint=True`.
+        """
+        self.source = source
+        self.sink = sink
+        self.max_workers = max_workers
+        self.item_options = item_options
+        self.metrics = WorkerMetrics()
+        self.stop_event = threading.Event()
+
+    def run(self) -> Dict[str, float]:
+        """Processes messages until the source is exhausted or `stop` is
+        called, then waits for in-flight granules.
+
+        Returns:
+            Dict[str, float]: The metrics summary, see `WorkerMetrics.summary`.
+        """
+        for key, value in GDAL_WORKER_OPTIONS.items():
+            os.environ.setdefault(key, value)
+
+        in_flight = threading.BoundedSemaphore(2 * self.max_workers)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for message in self.source.receive(self.stop_event):
+                in_flight.acquire()
+                future = executor.submit(self._process, message)
+                future.add_done_callback(lambda _: in_flight.release())
+        summary = self.metrics.summary()
+        logger.info(f"Worker stopped: {summary}")
+        return summary
+
+    def stop(self) -> None:
+        """Stops receiving messages. In-flight granules are completed."""
+        self.stop_event.set()
+
+    def _process(self, message: Message) -> Optional[Item]:
+        start = time.perf_counter()
+        try:
+            item = stac.create_item(message.href, **self.item_options)
+            self.sink.write(item)
+        except Exception:
+            logger.exception(f"Failed to create an Item for {message.href}")
+            self.metrics.record_failure()
+            self.source.fail(message)
+            return None
+        latency = time.perf_counter() - start
+        self.metrics.record(latency)
+        self.source.ack(message)
+        logger.info(f"Created {item.id} in {latency:.3f} s")
+        return item
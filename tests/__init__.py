@@ -1,7 +1,14 @@
+import os
 from typing import Any, Dict
 
+import numpy as np
+import rasterio
+from rasterio.enums import Resampling
+from rasterio.transform import from_origin
 from stactools.testing.test_data import TestData
 
+from stactools.hls import constants
+
 L30 = [
     "HLS.L30.T19LDD.2022165T144027.v2.0.B01.tif",
     "HLS.L30.T19LDD.2022165T144027.v2.0.B02.tif",
@@ -49,3 +56,112 @@ def create_external_data_dict() -> Dict[str, Dict[str, Any]]:
 external_data = create_external_data_dict()
 
 test_data = TestData(__file__, external_data=external_data)
+
+
+SENSING_TIME = {
+    "L30": "2022-06-14T14:40:27.6783440Z",
+    "S30": "2022-06-15T14:59:24.024Z; 2022-06-15T14:59:27.210Z",
+}
+
+CMR_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<Granule>
+  <Spatial>
+    <HorizontalSpatialDomain>
+      <Geometry>
+        <GPolygon>
+          <Boundary>
+            <Point>
+              <PointLongitude>-69.9</PointLongitude>
+              <PointLatitude>-14.5</PointLatitude>
+            </Point>
+            <Point>
+              <PointLongitude>-69.9</PointLongitude>
+              <PointLatitude>-14.4</PointLatitude>
+            </Point>
+            <Point>
+              <PointLongitude>-70.0</PointLongitude>
+              <PointLatitude>-14.4</PointLatitude>
+            </Point>
+            <Point>
+              <PointLongitude>-70.0</PointLongitude>
+              <PointLatitude>-14.5</PointLatitude>
+            </Point>
+            <Point>
+              <PointLongitude>-69.9</PointLongitude>
+              <PointLatitude>-14.5</PointLatitude>
+            </Point>
+          </Boundary>
+        </GPolygon>
+      </Geometry>
+    </HorizontalSpatialDomain>
+  </Spatial>
+</Granule>
+"""
+
+
+def create_granule(
+    directory: str,
+    granule_id: str = "HLS.L30.T19LDD.2022165T144027.v2.0",
+    size: int = 64,
+) -> str:
+    """Writes a small synthetic HLS granule (all band COGs and the CMR XML) to
+    a local directory and returns the HREF to its first EO band COG.
+
+    The left quarter of each EO band is nodata, and the Fmask band contains
+    a fixed mix of cloud, cloud shadow, snow/ice, and water pixels.
+    """
+    product = granule_id.split(".")[1]
+    profile = {
+        "driver": "GTiff",
+        "width": size,
+        "height": size,
+        "count": 1,
+        "crs": "EPSG:32619",
+        "transform": from_origin(399960.0, 8400000.0, 30.0, 30.0),
+        "tiled": True,
+        "blockxsize": 16,
+        "blockysize": 16,
+    }
+    tags = {
+        "SENSING_TIME": SENSING_TIME[product],
+        "HLS_PROCESSING_TIME": "2022-06-16T03:17:19Z",
+        "cloud_coverage": "12",
+        "MEAN_SUN_AZIMUTH_ANGLE": "35.1234",
+        "MEAN_VIEW_AZIMUTH_ANGLE": "100.5678",
+    }
+    if product == "S30":
+        tags["DATASTRIP_ID"] = "S2A_OPER_MSI_L1C_DS_2APS_20220615T183208"
+    else:
+        tags["LANDSAT_PRODUCT_ID"] = "LC08_L1TP_003069_20220614_20220616_02_T1"
+
+    quarter, half, eighth = size // 4, size // 2, size // 8
+    rows, cols = np.indices((size, size))
+    eo = (rows * size + cols).astype(np.int16)
+    eo[:, :quarter] = -9999
+    fmask = np.zeros((size, size), dtype=np.uint8)
+    fmask[:half, quarter:] |= 1 << 1  # cloud
+    fmask[half:, half:] |= 1 << 3  # cloud shadow
+    fmask[half:, quarter:half] |= 1 << 5  # water
+    fmask[:eighth, quarter:] |= 1 << 4  # snow/ice
+    fmask[:, :quarter] = 255
+
+    data: Any
+    bands = list(constants.BANDS[product]) + list(constants.BANDS["common"])
+    for band in bands:
+        if band == "Fmask":
+            data, dtype, nodata = fmask, "uint8", 255
+        elif band in constants.BANDS["common"]:
+            data, dtype, nodata = np.full_like(eo, 100), "int16", None
+        else:
+            data, dtype, nodata = eo, "int16", -9999
+        path = os.path.join(directory, f"{granule_id}.{band}.tif")
+        with rasterio.open(path, "w", dtype=dtype, nodata=nodata, **profile) as dst:
+            dst.write(data, 1)
+            dst.update_tags(**tags)
+            dst.build_overviews([2, 4], Resampling.nearest)
+
+    with open(os.path.join(directory, f"{granule_id}.cmr.xml"), "w") as f:
+        f.write(CMR_XML)
+
+    first_band = list(constants.BANDS[product])[0]
+    return os.path.join(directory, f"{granule_id}.{first_band}.tif")
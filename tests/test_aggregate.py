@@ -0,0 +1,43 @@
+from tempfile import TemporaryDirectory
+
+from stactools.hls import stac
+from stactools.hls.aggregate import ItemAggregator
+from tests import create_granule
+
+
+def test_aggregate_and_merge() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        l30 = stac.create_item(
+            create_granule(tmp_dir, "HLS.L30.T19LDD.2022165T144027.v2.0")
+        )
+        s30 = stac.create_item(
+            create_granule(tmp_dir, "HLS.S30.T20LDD.2022166T144741.v2.0")
+        )
+    s30.properties["eo:cloud_cover"] = 40
+
+    single = ItemAggregator()
+    single.add_item(l30)
+    single.add_item(s30)
+
+    first = ItemAggregator()
+    first.add_item(l30)
+    second = ItemAggregator()
+    second.add_item(s30)
+    merged = ItemAggregator.from_dict(first.to_dict())
+    merged.merge(ItemAggregator.from_dict(second.to_dict()))
+    assert merged.to_dict() == single.to_dict()
+    assert merged.count == 2
+
+    collection = stac.create_collection()
+    merged.update_collection(collection)
+    collection_dict = collection.to_dict()
+    summaries = collection_dict["summaries"]
+    assert summaries["platform"] == ["landsat-8", "sentinel-2a"]
+    assert summaries["mgrs:utm_zone"] == [19, 20]
+    assert summaries["eo:cloud_cover"] == {"minimum": 12, "maximum": 40}
+    assert collection_dict["hls:item_counts"] == {"HLSL30": 1, "HLSS30": 1}
+    interval = collection_dict["extent"]["temporal"]["interval"]
+    assert interval == [["2022-06-14T14:40:27.678344Z", "2022-06-15T14:59:27.210000Z"]]
+    assert collection_dict["extent"]["spatial"]["bbox"] == [
+        [-70.0, -14.5, -69.9, -14.4]
+    ]
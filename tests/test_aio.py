@@ -0,0 +1,97 @@
+import asyncio
+import os
+import time
+from tempfile import TemporaryDirectory
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from stactools.hls import aio, metadata, stac
+from stactools.hls.utils import id_from_href
+from tests import create_granule
+
+
+def item_dict(item: Any) -> Any:
+    d = item.to_dict(include_self_link=False)
+    del d["properties"]["created"]
+    return d
+
+
+def test_create_item_async_matches_create_item() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        href = create_granule(tmp_dir)
+        expected = stac.create_item(href, fmask_statistics=True)
+        item = asyncio.run(
+            aio.create_item_async(href, check_existence=True, fmask_statistics=True)
+        )
+    assert item_dict(item) == item_dict(expected)
+
+
+def test_create_items_async() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        hrefs = [
+            create_granule(tmp_dir),
+            create_granule(tmp_dir, "HLS.S30.T20LDD.2022167T144741.v2.0"),
+        ]
+        items = asyncio.run(
+            aio.create_items_async(hrefs, max_concurrency=4, use_raster_footprint=True)
+        )
+    assert [item.id for item in items] == [id_from_href(href) for href in hrefs]
+
+
+def test_create_item_async_missing_asset() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        href = create_granule(tmp_dir)
+        os.remove(href.replace(".B01.", ".Fmask."))
+        with pytest.raises(ValueError, match="Fmask"):
+            asyncio.run(aio.create_item_async(href, check_existence=True))
+
+
+def test_create_item_async_reads_concurrently() -> None:
+    delay = 0.2
+
+    def slow_header(href: str) -> metadata.CogHeader:
+        time.sleep(delay)
+        return metadata.read_cog_header(href)
+
+    exists = aio.AsyncReader.exists
+
+    async def slow_exists(self: aio.AsyncReader, href: str) -> bool:
+        await asyncio.sleep(delay)
+        return await exists(self, href)
+
+    with TemporaryDirectory() as tmp_dir:
+        href = create_granule(tmp_dir)
+        with patch.object(aio, "read_cog_header", slow_header), patch.object(
+            aio.AsyncReader, "exists", slow_exists
+        ):
+            start = time.perf_counter()
+            asyncio.run(aio.create_item_async(href, check_existence=True))
+            elapsed = time.perf_counter() - start
+    # 16 sequential reads would take more than 3 s
+    assert elapsed < 5 * delay
+
+
+def test_async_reader_closes_filesystems() -> None:
+    http = MagicMock(_session=AsyncMock(closed=False))
+    s3 = MagicMock(_s3creator=AsyncMock(), _session=None)
+    cls = MagicMock(async_impl=True)
+    filesystems = {"https": http, "s3": s3}
+
+    async def read() -> None:
+        async with aio.AsyncReader() as reader:
+            reader._filesystem("https://example.com/a.tif")
+            reader._filesystem("s3://bucket/a.tif")
+            reader._filesystem("https://example.com/b.tif")
+
+    with patch.object(
+        aio.fsspec, "get_filesystem_class", return_value=cls
+    ), patch.object(
+        aio.fsspec,
+        "filesystem",
+        side_effect=lambda protocol, **_: filesystems[protocol],
+    ):
+        asyncio.run(read())
+    http._session.close.assert_awaited_once()
+    s3._s3creator.__aexit__.assert_awaited_once_with(None, None, None)
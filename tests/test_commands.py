@@ -7,8 +7,9 @@ from click import Command, Group
 from stactools.testing.cli_test import CliTestCase
 
 from stactools.hls.commands import create_hls_command
+from stactools.hls.index import read_index
 from stactools.hls.utils import id_from_href
-from tests import test_data
+from tests import create_granule, test_data
 
 
 class CommandsTest(CliTestCase):
@@ -29,3 +30,115 @@ class CommandsTest(CliTestCase):
             item = pystac.read_file(item_path)
             assert item.id == "HLS.L30.T19LDD.2022165T144027.v2.0"
             item.validate()
+
+    def test_harvest_and_create_collection_from_index(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            href = create_granule(tmp_dir)
+            infile = os.path.join(tmp_dir, "hrefs.txt")
+            with open(infile, "w") as f:
+                f.write(f"{href}\n")
+            index_path = os.path.join(tmp_dir, "index.sqlite")
+            result = self.run_command(f"hls harvest {infile} {index_path}")
+            assert result.exit_code == 0, "\n{}".format(result.output)
+
+            outdir = os.path.join(tmp_dir, "collection")
+            result = self.run_command(
+                f"hls create-collection-from-index {index_path} {outdir}"
+            )
+            assert result.exit_code == 0, "\n{}".format(result.output)
+
+            collection = pystac.Collection.from_file(
+                os.path.join(outdir, "collection.json")
+            )
+            items = list(collection.get_all_items())
+            assert [item.id for item in items] == [id_from_href(href)]
+
+    def test_update_collection(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            first = create_granule(tmp_dir, "HLS.L30.T19LDD.2022165T144027.v2.0")
+            second = create_granule(tmp_dir, "HLS.S30.T19LDD.2022166T144741.v2.0")
+            infile = os.path.join(tmp_dir, "hrefs.txt")
+            with open(infile, "w") as f:
+                f.write(f"{first}\n")
+            index_path = os.path.join(tmp_dir, "index.sqlite")
+            result = self.run_command(f"hls harvest {infile} {index_path}")
+            assert result.exit_code == 0, "\n{}".format(result.output)
+            outdir = os.path.join(tmp_dir, "collection")
+            result = self.run_command(
+                f"hls create-collection-from-index {index_path} {outdir}"
+            )
+            assert result.exit_code == 0, "\n{}".format(result.output)
+
+            with open(infile, "w") as f:
+                f.write(f"{second}\n")
+            result = self.run_command(f"hls update-collection {infile} {outdir}")
+            assert result.exit_code == 0, "\n{}".format(result.output)
+
+            collection = pystac.Collection.from_file(
+                os.path.join(outdir, "collection.json")
+            )
+            items = list(collection.get_all_items())
+            assert [item.id for item in items] == [
+                id_from_href(first),
+                id_from_href(second),
+            ]
+
+    def test_create_and_merge_collection_shards(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            hrefs = [
+                create_granule(tmp_dir, "HLS.L30.T19LDD.2022165T144027.v2.0"),
+                create_granule(tmp_dir, "HLS.S30.T20LDD.2022166T144741.v2.0"),
+            ]
+            infile = os.path.join(tmp_dir, "hrefs.txt")
+            with open(infile, "w") as f:
+                f.write("".join(f"{href}\n" for href in hrefs))
+            outdir = os.path.join(tmp_dir, "collection")
+            for shard in range(2):
+                result = self.run_command(
+                    f"hls create-collection-shard {infile} {outdir} "
+                    f"--shard {shard} --num-shards 2"
+                )
+                assert result.exit_code == 0, "\n{}".format(result.output)
+            result = self.run_command(f"hls merge-collection {outdir}")
+            assert result.exit_code == 0, "\n{}".format(result.output)
+
+            collection = pystac.Collection.from_file(
+                os.path.join(outdir, "collection.json")
+            )
+            items = list(collection.get_all_items())
+            assert sorted(item.id for item in items) == [
+                id_from_href(href) for href in hrefs
+            ]
+
+    def test_harvest_reconcile(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            href = create_granule(tmp_dir)
+            # Superseded granule files that do not exist are never opened
+            superseded = href.replace(".v2.0.", ".v1.5.")
+            infile = os.path.join(tmp_dir, "hrefs.txt")
+            with open(infile, "w") as f:
+                f.write(f"{superseded}\n{href}\n")
+            index_path = os.path.join(tmp_dir, "index.sqlite")
+            result = self.run_command(
+                f"hls harvest {infile} {index_path} --reconcile latest"
+            )
+            assert result.exit_code == 0, "\n{}".format(result.output)
+
+            records = list(read_index(index_path))
+            assert [record.id for record in records] == [id_from_href(href)]
+
+    def test_inventory(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            href = create_granule(tmp_dir)
+            incomplete = create_granule(tmp_dir, "HLS.S30.T20LDD.2022167T144741.v2.0")
+            os.remove(incomplete.replace(".B01.", ".B02."))
+            infile = os.path.join(tmp_dir, "listing.txt")
+            with open(infile, "w") as f:
+                f.write("\n".join(sorted(os.listdir(tmp_dir))))
+            outfile = os.path.join(tmp_dir, "hrefs.txt")
+            result = self.run_command(f"hls inventory {infile} {outfile}")
+            assert result.exit_code == 0, "\n{}".format(result.output)
+
+            with open(outfile) as f:
+                hrefs = f.read().split()
+            assert [id_from_href(h) for h in hrefs] == [id_from_href(href)]
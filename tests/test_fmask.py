@@ -0,0 +1,42 @@
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import pytest
+
+from stactools.hls import constants, fmask, raster, stac, utils
+from tests import create_granule
+
+EXPECTED = {
+    "hls:valid_data_percentage": 75.0,
+    "hls:cloud_percentage": 50.0,
+    "hls:cloud_shadow_percentage": 33.33,
+    "hls:snow_ice_percentage": 12.5,
+    "hls:water_percentage": 16.67,
+}
+
+
+def test_fmask_statistics() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        href = utils.band_href(create_granule(tmp_dir), "Fmask")
+        full = fmask.fmask_statistics(raster.read_overview(href, min_size=64))
+        overview = fmask.fmask_statistics(raster.read_overview(href, min_size=16))
+    assert full == EXPECTED
+    assert overview == pytest.approx(EXPECTED, abs=5)
+
+
+def test_fmask_statistics_by_block() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        href = utils.band_href(create_granule(tmp_dir), "Fmask")
+        band = raster.read_overview(href, min_size=64)
+    # Blocks that do not divide the 64 rows evenly
+    with patch.object(constants, "RASTER_BLOCK_ROWS", 7):
+        assert fmask.fmask_statistics(band) == EXPECTED
+
+
+def test_create_item_with_fmask_statistics() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        href = create_granule(tmp_dir)
+        item = stac.create_item(href, fmask_statistics=True)
+        assert "hls:cloud_percentage" not in stac.create_item(href).properties
+    for key, value in EXPECTED.items():
+        assert item.properties[key] == value
@@ -0,0 +1,50 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+
+from stactools.hls import index, stac
+from tests import create_granule
+
+
+def test_harvest_and_read_index() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        hrefs = [
+            create_granule(tmp_dir, "HLS.L30.T19LDD.2022165T144027.v2.0"),
+            create_granule(tmp_dir, "HLS.S30.T19LDD.2022166T144741.v2.0"),
+        ]
+        index_path = os.path.join(tmp_dir, "index.sqlite")
+        assert index.harvest(hrefs, index_path, max_workers=2).harvested == 2
+        assert index.harvest(hrefs[:1], index_path).harvested == 1
+        records = [record.to_dict() for record in index.read_index(index_path)]
+        expected = [stac.create_granule_record(href).to_dict() for href in hrefs]
+        assert records == json.loads(json.dumps(expected))
+
+
+def test_harvest_skips_failed_and_existing_granules() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        hrefs = [
+            create_granule(tmp_dir, "HLS.L30.T19LDD.2022165T144027.v2.0"),
+            create_granule(tmp_dir, "HLS.S30.T19LDD.2022166T144741.v2.0"),
+            create_granule(tmp_dir, "HLS.S30.T19LDD.2022167T144741.v2.0"),
+        ]
+        missing = os.path.join(tmp_dir, "HLS.L30.T19LDD.2022168T144027.v2.0.B01.tif")
+        index_path = os.path.join(tmp_dir, "index.sqlite")
+        result = index.harvest(
+            hrefs[:1] + [missing] + hrefs[1:2], index_path, batch_size=2
+        )
+        assert result.harvested == 2
+        assert list(result.failed) == [missing]
+        assert len(list(index.read_index(index_path))) == 2
+
+        result = index.harvest(hrefs, index_path, batch_size=2, skip_existing=True)
+        assert result.harvested == 1
+        assert result.skipped == [
+            "HLS.L30.T19LDD.2022165T144027.v2.0",
+            "HLS.S30.T19LDD.2022166T144741.v2.0",
+        ]
+        assert result.failed == {}
+        assert [record.id for record in index.read_index(index_path)] == [
+            "HLS.L30.T19LDD.2022165T144027.v2.0",
+            "HLS.S30.T19LDD.2022166T144741.v2.0",
+            "HLS.S30.T19LDD.2022167T144741.v2.0",
+        ]
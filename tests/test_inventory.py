@@ -0,0 +1,104 @@
+import numpy as np
+
+from stactools.hls import constants, inventory, utils
+
+L30_ID = "HLS.L30.T19LDD.2022165T144027.v2.0"
+S30_ID = "HLS.S30.T60VXR.2022178T233701.v2.0"
+
+
+def granule_hrefs(granule_id: str, product: str) -> list:
+    bands = list(constants.BANDS[product]) + list(constants.BANDS["common"])
+    return [f"s3://bucket/{granule_id}.{band}.tif" for band in bands]
+
+
+def test_inventory_hrefs_matches_parse_href() -> None:
+    hrefs = [
+        f"s3://bucket/{L30_ID}.B01.tif",
+        f"/data/{S30_ID}.Fmask.tif",
+        f"{S30_ID}.cmr.xml",
+        "https://example.com/HLS.L30.T19LDD.2022165T144027.v10.0.B8A.tif",
+        f"https://example.com/{L30_ID}.B02.tif?X-Amz-Credential=a/b&X-Amz-Signature=c",
+        "s3://bucket/readme.txt",
+        "s3://bucket/HLS.L30.T19LDD.2022165T144027.v2.0.tif",
+        "s3://bucket/HLS.M30.T19LDD.2022165T144027.v2.0.B01.tif",
+        "s3://bucket/HLS.L30.T19LDD.2022165T144027.v2.0.B01.x.tif",
+    ]
+    result = inventory.inventory_hrefs(np.array(hrefs))
+    assert result.valid.tolist() == [True] * 5 + [False] * 4
+    for i, href in enumerate(hrefs[:5]):
+        parsed = utils.parse_href(href)
+        assert result.granule_id[i] == parsed.granule_id
+        assert result.product[i] == parsed.product
+        assert result.tile_id[i] == parsed.tile_id
+        assert result.version[i] == parsed.version
+        assert result.band[i] == parsed.band
+        assert result.extension[i] == parsed.extension
+    assert result.acquisition_date[:2].tolist() == [
+        np.datetime64("2022-06-14"),
+        np.datetime64("2022-06-27"),
+    ]
+    assert np.isnat(result.acquisition_date[5:]).all()
+    assert (result.granule_id[5:] == "").all()
+
+
+def test_inventory_hrefs_invalid_sensing_time() -> None:
+    hrefs = [
+        "HLS.L30.T19LDD.2022000T144027.v12.0.B01.tif",
+        "HLS.L30.T19LDD.2022000T144027.v2.0.B01.tif",
+        "HLS.L30.T19LDD.2022999T144027.v2.0.B01.tif",
+        "HLS.L30.T19LDD.2022366T144027.v2.0.B01.tif",
+        "HLS.L30.T19LDD.2022165T244027.v2.0.B01.tif",
+        "HLS.L30.T19LDD.2022165T146027.v2.0.B01.tif",
+        "HLS.L30.T19LDD.2022165T144060.v2.0.B01.tif",
+        "HLS.L30.T19LDD.2020366T235959.v2.0.B01.tif",
+        "HLS.L30.T19LDD.2020366T235959.v12.0.B01.tif",
+        f"{L30_ID}.B01.tif",
+    ]
+    result = inventory.inventory_hrefs(hrefs)
+    assert result.valid.tolist() == [False] * 7 + [True] * 3
+    assert result.acquisition_date[7:].tolist() == [
+        np.datetime64("2020-12-31"),
+        np.datetime64("2020-12-31"),
+        np.datetime64("2022-06-14"),
+    ]
+    assert np.isnat(result.acquisition_date[:7]).all()
+    for href, valid in zip(hrefs, result.valid):
+        try:
+            utils.parse_href(href)
+        except utils.InvalidHref:
+            assert not valid
+        else:
+            assert valid
+
+
+def test_inventory_granules() -> None:
+    l30 = granule_hrefs(L30_ID, "L30")
+    s30 = granule_hrefs(S30_ID, "S30")
+    s30.remove(f"s3://bucket/{S30_ID}.B8A.tif")
+    s30.remove(f"s3://bucket/{S30_ID}.VZA.tif")
+    # Non-EO bands first, and duplicate and non-COG files
+    hrefs = l30[::-1] + s30 + l30[:2] + [f"s3://bucket/{L30_ID}.cmr.xml"]
+
+    granules = inventory.inventory_granules(inventory.inventory_hrefs(hrefs))
+    assert granules.granule_id.tolist() == [L30_ID, S30_ID]
+    assert granules.product.tolist() == ["L30", "S30"]
+    assert granules.tile_id.tolist() == ["T19LDD", "T60VXR"]
+    assert granules.complete.tolist() == [True, False]
+    assert granules.band_count.tolist() == [len(l30), len(s30)]
+    assert granules.missing_bands == {S30_ID: ["B8A", "VZA"]}
+    for href, product in zip(granules.href, granules.product):
+        assert utils.band_name_from_href(href) in constants.BANDS[product]
+
+
+def test_inventory_granules_without_eo_band() -> None:
+    hrefs = [f"s3://bucket/{L30_ID}.Fmask.tif"]
+    granules = inventory.inventory_granules(inventory.inventory_hrefs(hrefs))
+    assert granules.href.tolist() == [""]
+    assert granules.band_count.tolist() == [1]
+    assert not granules.complete[0]
+
+
+def test_inventory_empty() -> None:
+    granules = inventory.inventory_granules(inventory.inventory_hrefs([]))
+    assert granules.granule_id.size == 0
+    assert granules.missing_bands == {}
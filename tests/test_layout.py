@@ -0,0 +1,77 @@
+import os
+from tempfile import TemporaryDirectory
+
+import pystac
+import pytest
+from pystac import CatalogType
+
+from stactools.hls import layout, stac, writer
+from tests import create_granule
+
+
+def test_tile_time_layout() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        items = [
+            stac.create_item(create_granule(tmp_dir, granule_id))
+            for granule_id in [
+                "HLS.L30.T19LDD.2022165T144027.v2.0",
+                "HLS.S30.T19LDD.2022166T144741.v2.0",
+                "HLS.S30.T20LDD.2022166T144741.v2.0",
+            ]
+        ]
+        items[1].datetime = items[1].datetime.replace(month=7)  # type: ignore
+        del items[1].properties["start_datetime"]
+        del items[1].properties["end_datetime"]
+
+        outdir = os.path.join(tmp_dir, "collection")
+        collection = stac.create_collection()
+        collection.set_self_href(os.path.join(outdir, "collection.json"))
+        item_layout = layout.get_layout("tile-time", collection)
+        for item in items:
+            item_layout.add_item(item)
+        item_layout.finalize()
+        collection.catalog_type = CatalogType.SELF_CONTAINED
+        writer.save_catalog(collection)
+
+        collection = pystac.Collection.from_file(
+            os.path.join(outdir, "collection.json")
+        )
+        assert not list(collection.get_item_links())
+        assert [child.id for child in collection.get_children()] == [
+            "hls-19L",
+            "hls-20L",
+        ]
+        zone = collection.get_child("hls-19L")
+        assert isinstance(zone, pystac.Collection)
+        assert zone.extra_fields["hls:item_counts"] == {"HLSL30": 1, "HLSS30": 1}
+        year = zone.get_child("hls-19L-2022")
+        assert year is not None
+        assert [child.id for child in year.get_children()] == [
+            "hls-19L-2022-06",
+            "hls-19L-2022-07",
+        ]
+        month = year.get_child("hls-19L-2022-07")
+        assert isinstance(month, pystac.Collection)
+        assert [item.id for item in month.get_items()] == [items[1].id]
+        month_item = next(month.get_items())
+        assert month_item.collection_id == collection.id
+        collection_link = month_item.get_single_link("collection")
+        assert collection_link is not None
+        assert collection_link.get_absolute_href() == collection.get_self_href()
+        parent_link = month_item.get_single_link("parent")
+        assert parent_link is not None
+        assert parent_link.get_absolute_href() == month.get_self_href()
+        assert month.extent.temporal.intervals[0][0] == items[1].datetime
+        assert os.path.exists(
+            os.path.join(
+                outdir,
+                "hls-19L/hls-19L-2022/hls-19L-2022-07",
+                f"{items[1].id}/{items[1].id}.json",
+            )
+        )
+        assert len(list(collection.get_items(recursive=True))) == 3
+
+
+def test_unknown_layout() -> None:
+    with pytest.raises(ValueError):
+        layout.get_layout("tile", stac.create_collection())
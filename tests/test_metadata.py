@@ -0,0 +1,50 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from stactools.hls.metadata import Metadata, hls_metadata, read_cog_header
+from tests import create_granule
+
+
+def test_metadata() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        href = create_granule(tmp_dir, "HLS.S30.T19LDD.2022166T144741.v2.0")
+        metadata = hls_metadata(href)
+    assert metadata.epsg == 32619
+    assert metadata.platform == "sentinel-2a"
+    assert metadata.mgrs == {
+        "mgrs:utm_zone": 19,
+        "mgrs:latitude_band": "L",
+        "mgrs:grid_square": "DD",
+    }
+    assert metadata.cloud_cover == 12
+    assert metadata.processing_datetime.isoformat() == "2022-06-16T03:17:19+00:00"
+    assert metadata.start_end_datetime == {
+        "start_datetime": "2022-06-15T14:59:24.024000Z",
+        "end_datetime": "2022-06-15T14:59:27.210000Z",
+    }
+
+
+def test_metadata_derived_properties_are_cached() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        href = create_granule(tmp_dir)
+        metadata = hls_metadata(href)
+    assert metadata.mgrs is metadata.mgrs
+    assert metadata.processing_datetime is metadata.processing_datetime
+    assert metadata.epsg == 32619
+    metadata.wkt = "not a wkt string"
+    assert metadata.epsg == 32619
+
+
+def test_xml_geometry_local_file() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        href = create_granule(tmp_dir)
+        metadata = hls_metadata(href)
+        uri_metadata = hls_metadata(Path(href).as_uri())
+        with open(metadata.xml_href, "rb") as f:
+            cmr_xml = f.read()
+        geometry = metadata.geometry(use_raster_footprint=False)
+        assert uri_metadata.geometry(use_raster_footprint=False) == geometry
+        header = read_cog_header(href)
+    in_memory = Metadata(href, header=header, cmr_xml=cmr_xml)
+    assert in_memory.geometry(use_raster_footprint=False) == geometry
+    assert geometry["type"] == "Polygon"
@@ -0,0 +1,99 @@
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import numpy as np
+import rasterio
+from affine import Affine
+from rasterio.crs import CRS
+
+from stactools.hls import constants, raster, stac
+from tests import create_granule
+
+
+def test_select_overview_level() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        href = create_granule(tmp_dir)
+        with rasterio.open(href) as dataset:
+            assert raster.select_overview_level(dataset, 64) is None
+            assert raster.select_overview_level(dataset, 32) == 0
+            assert raster.select_overview_level(dataset, 16) == 1
+
+
+def test_granule_rasters_decode_once() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        href = create_granule(tmp_dir)
+        rasters = raster.GranuleRasters(min_size=32)
+        with patch.object(
+            raster, "read_overview", wraps=raster.read_overview
+        ) as read_overview:
+            first = rasters.read(href)
+            assert rasters.read(href) is first
+            assert read_overview.call_count == 1
+    assert first.data.shape == (32, 32)
+    assert np.count_nonzero(first.valid_mask()) == 32 * 24
+
+
+def test_raster_footprint_does_not_depend_on_statistics() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        href = create_granule(tmp_dir)
+        geometry = stac.create_item(href, use_raster_footprint=True).geometry
+        with patch.object(
+            raster, "read_overview", wraps=raster.read_overview
+        ) as read_overview:
+            item = stac.create_item(
+                href, use_raster_footprint=True, fmask_statistics=True
+            )
+            assert read_overview.call_count == 1
+        with_statistics = stac.create_item(
+            href, use_raster_footprint=True, raster_statistics=True
+        )
+    assert item.properties["hls:cloud_percentage"] == 50.0
+    assert item.geometry == geometry
+    assert with_statistics.geometry == geometry
+
+
+def test_band_statistics() -> None:
+    band = raster.RasterData(
+        data=np.array([[1, 2], [3, -9999]], dtype=np.int16),
+        nodata=-9999,
+        transform=Affine.identity(),
+        crs=CRS.from_epsg(32619),
+    )
+    assert raster.band_statistics(band) == {
+        "statistics": {
+            "minimum": 1,
+            "maximum": 3,
+            "mean": 2.0,
+            "stddev": 0.8165,
+            "valid_percent": 75.0,
+        }
+    }
+    histogram = raster.band_statistics(band, histogram=True)["histogram"]
+    assert histogram["count"] == constants.HISTOGRAM_BUCKETS
+    assert len(histogram["buckets"]) == constants.HISTOGRAM_BUCKETS
+    assert sum(histogram["buckets"]) == 3
+    assert (histogram["min"], histogram["max"]) == (1, 3)
+
+
+def test_raster_statistics_read_each_band_once() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        href = create_granule(tmp_dir)
+        with patch.object(
+            raster, "read_overview", wraps=raster.read_overview
+        ) as read_overview:
+            item = stac.create_item(
+                href,
+                use_raster_footprint=True,
+                fmask_statistics=True,
+                raster_histograms=True,
+            )
+            assert read_overview.call_count == len(item.assets)
+    blue = item.assets["blue"].extra_fields["raster:bands"][0]
+    assert blue["nodata"] == -9999
+    assert blue["statistics"]["minimum"] == 16
+    assert blue["statistics"]["maximum"] == 64 * 64 - 1
+    assert blue["statistics"]["valid_percent"] == 75.0
+    assert sum(blue["histogram"]["buckets"]) == 64 * 48
+    fmask = item.assets["fmask"].extra_fields["raster:bands"][0]
+    assert fmask["statistics"]["valid_percent"] == 75.0
+    assert item.properties["hls:valid_data_percentage"] == 75.0
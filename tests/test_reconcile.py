@@ -0,0 +1,34 @@
+import pytest
+
+from stactools.hls import reconcile
+
+V15 = "s3://bucket/HLS.L30.T19LDD.2022165T144027.v1.5.B01.tif"
+V20 = "s3://bucket/HLS.L30.T19LDD.2022165T144027.v2.0.B01.tif"
+# A different acquisition on the same day, e.g., from an overlapping orbit
+SAME_DAY = "s3://bucket/HLS.L30.T19LDD.2022165T144010.v2.0.B01.tif"
+OTHER_DAY = "s3://bucket/HLS.L30.T19LDD.2022166T144027.v2.0.B01.tif"
+OTHER_PRODUCT = "s3://bucket/HLS.S30.T19LDD.2022165T144027.v2.0.B01.tif"
+
+
+def test_reconcile_latest() -> None:
+    hrefs = [V15, OTHER_DAY, SAME_DAY, V20, OTHER_PRODUCT, V15]
+    result = reconcile.reconcile_hrefs(hrefs)
+    assert result.kept == [OTHER_DAY, SAME_DAY, V20, OTHER_PRODUCT]
+    assert result.dropped == {V15: "HLS.L30.T19LDD.2022165T144027.v2.0"}
+
+
+def test_reconcile_earliest() -> None:
+    result = reconcile.reconcile_hrefs([V20, V15, SAME_DAY], "earliest")
+    assert result.kept == [V15, SAME_DAY]
+    assert result.dropped == {V20: "HLS.L30.T19LDD.2022165T144027.v1.5"}
+
+
+def test_reconcile_orders_versions_numerically() -> None:
+    v10 = "s3://bucket/HLS.L30.T19LDD.2022165T144027.v10.0.B01.tif"
+    v9 = "s3://bucket/HLS.L30.T19LDD.2022165T144027.v9.0.B01.tif"
+    assert reconcile.reconcile_hrefs([v10, v9]).kept == [v10]
+
+
+def test_reconcile_unknown_policy() -> None:
+    with pytest.raises(ValueError):
+        reconcile.reconcile_hrefs([V20], "newest")
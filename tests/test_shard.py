@@ -0,0 +1,79 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+
+import pystac
+import pytest
+
+from stactools.hls import shard
+from tests import create_granule
+
+HREFS = [
+    f"/data/HLS.{product}.T{zone}LDD.2022{day}T144027.v2.0.B01.tif"
+    for product in ["L30", "S30"]
+    for zone in range(10, 20)
+    for day in range(100, 110)
+]
+
+
+def test_select_shard() -> None:
+    for shard_by in shard.SHARD_BY:
+        shards = [shard.select_shard(HREFS, i, 4, shard_by) for i in range(4)]
+        assert sorted(href for hrefs in shards for href in hrefs) == sorted(HREFS)
+        assert shards == [shard.select_shard(HREFS, i, 4, shard_by) for i in range(4)]
+    for hrefs in [shard.select_shard(HREFS, i, 4, "zone") for i in range(4)]:
+        zones = {href.split(".")[2][1:3] for href in hrefs}
+        for other in HREFS:
+            if other.split(".")[2][1:3] in zones:
+                assert other in hrefs
+    with pytest.raises(ValueError):
+        shard.select_shard(HREFS, 4, 4)
+
+
+def test_create_and_merge_shards() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        hrefs = [
+            create_granule(tmp_dir, "HLS.L30.T19LDD.2022165T144027.v2.0"),
+            create_granule(tmp_dir, "HLS.S30.T19LDD.2022166T144741.v2.0"),
+            create_granule(tmp_dir, "HLS.S30.T20LDD.2022167T144741.v2.0"),
+        ]
+        outdir = os.path.join(tmp_dir, "collection")
+        shard.create_shard(hrefs, outdir, 0, 2)
+        with pytest.raises(ValueError):
+            shard.merge_shards(outdir)
+        shard.create_shard(hrefs, outdir, 1, 2)
+        shard.merge_shards(outdir)
+
+        assert not any(name.startswith("partial-") for name in os.listdir(outdir))
+        with open(os.path.join(outdir, "collection.json")) as f:
+            collection_dict = json.load(f)
+        assert collection_dict["hls:item_counts"] == {"HLSL30": 1, "HLSS30": 2}
+        collection = pystac.Collection.from_file(
+            os.path.join(outdir, "collection.json")
+        )
+        items = list(collection.get_items())
+        assert sorted(item.id for item in items) == [
+            "HLS.L30.T19LDD.2022165T144027.v2.0",
+            "HLS.S30.T19LDD.2022166T144741.v2.0",
+            "HLS.S30.T20LDD.2022167T144741.v2.0",
+        ]
+        for item in items:
+            assert item.get_collection() is not None
+            assert item.assets["blue"].href.startswith("../../")
+
+
+def test_create_empty_shard() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        href = create_granule(tmp_dir)
+        outdir = os.path.join(tmp_dir, "collection")
+        num_shards = 3
+        empty = next(
+            i
+            for i in range(num_shards)
+            if not shard.select_shard([href], i, num_shards)
+        )
+        partial_href = shard.create_shard([href], outdir, empty, num_shards)
+        with open(partial_href) as f:
+            partial = json.load(f)
+        assert partial["items"] == []
+        assert partial["aggregate"]["product_counts"] == {}
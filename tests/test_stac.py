@@ -1,9 +1,12 @@
+import pickle
+from tempfile import TemporaryDirectory
+
 import pytest
 import shapely.geometry
 from stactools.core.utils.antimeridian import Strategy
 
 from stactools.hls import stac
-from tests import L30, test_data
+from tests import L30, create_granule, test_data
 
 
 def test_create_l30_item() -> None:
@@ -93,6 +96,22 @@ def test_antimeridian_split() -> None:
     item.validate()
 
 
+def test_create_item_from_record() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        href = create_granule(tmp_dir, "HLS.S30.T19LDD.2022166T144741.v2.0")
+        record = stac.create_granule_record(href)
+        item = stac.create_item(href)
+    record = pickle.loads(pickle.dumps(record))
+    assert record.id == "HLS.S30.T19LDD.2022166T144741.v2.0"
+    item_from_record = stac.create_item_from_record(record)
+    item_dict = item.to_dict()
+    record_dict = item_from_record.to_dict()
+    del item_dict["properties"]["created"]
+    del record_dict["properties"]["created"]
+    assert record_dict == item_dict
+    assert record_dict["properties"]["start_datetime"] == "2022-06-15T14:59:24.024000Z"
+
+
 def test_create_collection() -> None:
     collection = stac.create_collection()
     assert collection.id == "hls"
@@ -0,0 +1,120 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+from typing import List
+
+import pystac
+import rasterio
+from pystac import CatalogType
+
+from stactools.hls import layout, stac, update, writer
+from stactools.hls.aggregate import ItemAggregator
+from tests import create_granule
+
+
+def create_collection(outdir: str, hrefs: List[str], layout_name: str) -> None:
+    collection = stac.create_collection()
+    collection.set_self_href(os.path.join(outdir, "collection.json"))
+    item_layout = layout.get_layout(layout_name, collection)
+    aggregator = ItemAggregator()
+    for href in hrefs:
+        item = stac.create_item(href)
+        aggregator.add_item(item)
+        item_layout.add_item(item)
+    aggregator.update_collection(collection)
+    item_layout.finalize()
+    collection.catalog_type = CatalogType.SELF_CONTAINED
+    collection.make_all_asset_hrefs_relative()
+    writer.save_catalog(collection)
+
+
+def test_update_collection() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        first = create_granule(tmp_dir, "HLS.L30.T19LDD.2022165T144027.v2.0")
+        second = create_granule(tmp_dir, "HLS.S30.T19LDD.2022166T144741.v2.0")
+        outdir = os.path.join(tmp_dir, "collection")
+        collection_href = os.path.join(outdir, "collection.json")
+        create_collection(outdir, [first], "flat")
+        first_id = "HLS.L30.T19LDD.2022165T144027.v2.0"
+        first_href = os.path.join(outdir, first_id, f"{first_id}.json")
+        with open(first_href) as f:
+            created = json.load(f)["properties"]["created"]
+
+        result = update.update_collection(collection_href, [first, second])
+        assert result.added == ["HLS.S30.T19LDD.2022166T144741.v2.0"]
+        assert result.unchanged == [first_id]
+        assert result.replaced == []
+        assert result.files_written == 2
+
+        result = update.update_collection(collection_href, [first, second])
+        assert result.unchanged == [first_id, "HLS.S30.T19LDD.2022166T144741.v2.0"]
+        assert result.files_written == 0
+
+        with rasterio.open(first, "r+") as dataset:
+            dataset.update_tags(cloud_coverage="80")
+        result = update.update_collection(collection_href, [first])
+        assert result.replaced == [first_id]
+        assert result.files_written == 2
+
+        with open(first_href) as f:
+            properties = json.load(f)["properties"]
+        assert properties["eo:cloud_cover"] == 80
+        assert properties["created"] == created
+        assert "updated" in properties
+
+        collection = pystac.Collection.from_file(collection_href)
+        assert collection.extra_fields["hls:item_counts"] == {
+            "HLSL30": 1,
+            "HLSS30": 1,
+        }
+        cloud_cover = collection.summaries.get_range("eo:cloud_cover")
+        assert cloud_cover is not None
+        assert (cloud_cover.minimum, cloud_cover.maximum) == (12, 80)
+        assert [link.href for link in collection.get_item_links()] == [
+            f"./{first_id}/{first_id}.json",
+            "./HLS.S30.T19LDD.2022166T144741.v2.0/"
+            "HLS.S30.T19LDD.2022166T144741.v2.0.json",
+        ]
+        assert len(list(collection.get_items())) == 2
+
+
+def test_update_collection_tile_time() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        first = create_granule(tmp_dir, "HLS.L30.T19LDD.2022165T144027.v2.0")
+        second = create_granule(tmp_dir, "HLS.S30.T19LDD.2022166T144741.v2.0")
+        third = create_granule(tmp_dir, "HLS.S30.T20LDD.2022166T144741.v2.0")
+        outdir = os.path.join(tmp_dir, "collection")
+        collection_href = os.path.join(outdir, "collection.json")
+        create_collection(outdir, [first], "tile-time")
+
+        result = update.update_collection(
+            collection_href, [second], layout_name="tile-time"
+        )
+        # The Item, its month, year, and zone Collections, and the root
+        assert result.files_written == 5
+        result = update.update_collection(
+            collection_href, [third], layout_name="tile-time"
+        )
+        assert result.files_written == 5
+        result = update.update_collection(
+            collection_href, [first, second, third], layout_name="tile-time"
+        )
+        assert len(result.unchanged) == 3
+        assert result.files_written == 0
+
+        collection = pystac.Collection.from_file(collection_href)
+        assert [child.id for child in collection.get_children()] == [
+            "hls-19L",
+            "hls-20L",
+        ]
+        assert collection.extra_fields["hls:item_counts"] == {
+            "HLSL30": 1,
+            "HLSS30": 2,
+        }
+        zone = collection.get_child("hls-19L")
+        assert isinstance(zone, pystac.Collection)
+        assert zone.extra_fields["hls:item_counts"] == {"HLSL30": 1, "HLSS30": 1}
+        year = zone.get_child("hls-19L-2022")
+        assert year is not None
+        assert [child.id for child in year.get_children()] == ["hls-19L-2022-06"]
+        assert len(list(collection.get_items(recursive=True))) == 3
@@ -0,0 +1,162 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from dateutil.parser import parse
+
+from stactools.hls import utils
+
+
+def test_parse_hls_datetime() -> None:
+    for value in [
+        "2022-06-14T14:40:27.6783440Z",
+        "2022-06-15T14:59:24.024Z",
+        " 2022-06-15T14:59:27.210Z",
+        "2022-06-16T03:17:19Z",
+    ]:
+        t = utils.parse_hls_datetime(value)
+        assert t.tzinfo == timezone.utc
+        assert t == parse(value).replace(tzinfo=timezone.utc)
+    assert utils.parse_hls_datetime("2022-06-14T14:40:27.6783440Z") == datetime(
+        2022, 6, 14, 14, 40, 27, 678344, tzinfo=timezone.utc
+    )
+
+
+def test_parse_hls_datetime_fallback() -> None:
+    t = utils.parse_hls_datetime("2022-06-16 03:17:19+00:00")
+    assert t == datetime(2022, 6, 16, 3, 17, 19, tzinfo=timezone.utc)
+
+
+def test_parse_href() -> None:
+    href = "s3://bucket/l30/HLS.L30.T19LDD.2022165T144027.v2.0.B01.tif"
+    parsed = utils.parse_href(href)
+    assert parsed.href == href
+    assert parsed.granule_id == "HLS.L30.T19LDD.2022165T144027.v2.0"
+    assert parsed.product == "L30"
+    assert parsed.tile_id == "T19LDD"
+    assert (parsed.utm_zone, parsed.latitude_band, parsed.grid_square) == (
+        19,
+        "L",
+        "DD",
+    )
+    assert parsed.sensing_time == "2022165T144027"
+    assert parsed.version == "v2.0"
+    assert parsed.band == "B01"
+    assert parsed.extension == "tif"
+    assert utils.parse_href(href) is parsed
+
+    leap_day = utils.parse_href("HLS.S30.T60VXR.2020366T235959.v2.0.B01.tif")
+    assert leap_day.sensing_time == "2020366T235959"
+
+    xml = utils.parse_href("HLS.S30.T60VXR.2022178T233701.v2.0.cmr.xml")
+    assert xml.granule_id == "HLS.S30.T60VXR.2022178T233701.v2.0"
+    assert xml.band == "cmr"
+
+
+def test_parse_href_signed_url() -> None:
+    href = (
+        "https://bucket.s3.amazonaws.com/l30/"
+        "HLS.L30.T19LDD.2022165T144027.v2.0.B01.tif"
+        "?X-Amz-Credential=KEY%2F20220614/us-west-2/s3/aws4_request"
+        "&X-Amz-Signature=abc#frag"
+    )
+    parsed = utils.parse_href(href)
+    assert parsed.href == href
+    assert parsed.granule_id == "HLS.L30.T19LDD.2022165T144027.v2.0"
+    assert parsed.band == "B01"
+    assert parsed.extension == "tif"
+    base = "https://bucket.s3.amazonaws.com/l30/HLS.L30.T19LDD.2022165T144027.v2.0"
+    assert utils.band_href(href, "Fmask") == f"{base}.Fmask.tif"
+    assert utils.cmr_xml_href(href) == f"{base}.cmr.xml"
+
+
+def test_href_helpers() -> None:
+    href = "/data/HLS.S30.T19LDD.2022166T144741.v2.0.Fmask.tif"
+    assert utils.id_from_href(href) == "HLS.S30.T19LDD.2022166T144741.v2.0"
+    assert utils.product_from_href(href) == "S30"
+    assert utils.tile_id_from_href(href) == "T19LDD"
+    assert utils.version_from_href(href) == "v2.0"
+    assert utils.band_name_from_href(href) == "Fmask"
+
+
+@pytest.mark.parametrize(
+    "filename,field,value",
+    [
+        ("HLS.L30.T19LDD.2022165T144027.v2.0.tif", None, None),
+        ("HLX.L30.T19LDD.2022165T144027.v2.0.B01.tif", "prefix", "HLX"),
+        ("HLS.M30.T19LDD.2022165T144027.v2.0.B01.tif", "product", "M30"),
+        ("HLS.L30.19LDD.2022165T144027.v2.0.B01.tif", "tile_id", "19LDD"),
+        (
+            "HLS.L30.T19LDD.20221651T44027.v2.0.B01.tif",
+            "sensing_time",
+            "20221651T44027",
+        ),
+        ("HLS.L30.T19LDD.2022165T144027.2.0.B01.tif", "version", "2.0"),
+        (
+            "HLS.L30.T19LDD.2022000T144027.v2.0.B01.tif",
+            "sensing_time",
+            "2022000T144027",
+        ),
+        (
+            "HLS.L30.T19LDD.2022366T144027.v2.0.B01.tif",
+            "sensing_time",
+            "2022366T144027",
+        ),
+        (
+            "HLS.L30.T19LDD.2022165T994027.v2.0.B01.tif",
+            "sensing_time",
+            "2022165T994027",
+        ),
+        (
+            "HLS.L30.T19LDD.2022165T146027.v2.0.B01.tif",
+            "sensing_time",
+            "2022165T146027",
+        ),
+        (
+            "HLS.L30.T19LDD.2022165T144060.v2.0.B01.tif",
+            "sensing_time",
+            "2022165T144060",
+        ),
+    ],
+)
+def test_parse_href_invalid(
+    filename: str, field: Optional[str], value: Optional[str]
+) -> None:
+    href = f"/data/{filename}"
+    with pytest.raises(utils.InvalidHref) as excinfo:
+        utils.parse_href(href)
+    assert excinfo.value.href == href
+    assert excinfo.value.field == field
+    assert excinfo.value.value == value
+    assert isinstance(excinfo.value, ValueError)
+
+
+def test_exists(tmp_path: Path) -> None:
+    path = tmp_path / "file.txt"
+    path.write_text("HLS")
+    assert utils.exists(str(path))
+    assert utils.exists(path.as_uri())
+    assert not utils.exists(str(tmp_path / "missing.txt"))
+    assert not utils.exists(str(tmp_path))
+
+
+def test_local_path(tmp_path: Path) -> None:
+    path = tmp_path / "my granule#1.xml"
+    assert "%20" in path.as_uri()
+    assert utils.local_path(path.as_uri()) == str(path)
+    assert utils.local_path(str(path)) == str(path)
+    assert utils.local_path("s3://bucket/my%20granule.xml") is None
+    path.write_text("HLS")
+    assert utils.exists(path.as_uri())
+
+
+def test_map_file(tmp_path: Path) -> None:
+    path = tmp_path / "file.xml"
+    path.write_bytes(b"<Granule/>")
+    with utils.map_file(str(path)) as buffer:
+        assert buffer[:] == b"<Granule/>"
+    empty = tmp_path / "empty.xml"
+    empty.write_bytes(b"")
+    with utils.map_file(str(empty)) as buffer:
+        assert buffer == b""
@@ -0,0 +1,107 @@
+import io
+import os
+import threading
+import time
+from tempfile import TemporaryDirectory
+from typing import Iterator, List
+
+import pystac
+
+from stactools.hls import worker
+from stactools.hls.utils import id_from_href
+from tests import create_granule
+
+
+class ListSource(worker.QueueSource):
+    def __init__(self, hrefs: List[str]) -> None:
+        self.hrefs = hrefs
+        self.acked: List[str] = []
+        self.failed: List[str] = []
+        self.lock = threading.Lock()
+
+    def receive(self, stop: threading.Event) -> Iterator[worker.Message]:
+        for href in self.hrefs:
+            yield worker.Message(href)
+
+    def ack(self, message: worker.Message) -> None:
+        with self.lock:
+            self.acked.append(message.href)
+
+    def fail(self, message: worker.Message) -> None:
+        with self.lock:
+            self.failed.append(message.href)
+
+
+def test_worker() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        hrefs = [
+            create_granule(tmp_dir),
+            create_granule(tmp_dir, "HLS.S30.T20LDD.2022167T144741.v2.0"),
+        ]
+        missing = os.path.join(tmp_dir, "HLS.L30.T19LDD.2022166T144027.v2.0.B01.tif")
+        source = ListSource(hrefs + [missing])
+        outdir = os.path.join(tmp_dir, "items")
+        summary = worker.Worker(
+            source, worker.DirectorySink(outdir), max_workers=2
+        ).run()
+
+        assert summary["created"] == 2
+        assert summary["failed"] == 1
+        assert summary["max"] >= summary["p50"] > 0
+        assert sorted(source.acked) == sorted(hrefs)
+        assert source.failed == [missing]
+        for href in hrefs:
+            item = pystac.Item.from_file(
+                os.path.join(outdir, f"{id_from_href(href)}.json")
+            )
+            assert item.assets["blue"].href.startswith("../")
+
+
+def test_stream_source() -> None:
+    stream = io.StringIO("a.tif\n\n b.tif \n")
+    messages = list(worker.StreamSource(stream).receive(threading.Event()))
+    assert [message.href for message in messages] == ["a.tif", "b.tif"]
+
+
+def test_spool_source() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        for name, href in [("1", "a.tif"), ("2", "b.tif"), (".3", "c.tif")]:
+            with open(os.path.join(tmp_dir, name), "w") as f:
+                f.write(f"{href}\n")
+        source = worker.SpoolSource(tmp_dir, exit_when_empty=True)
+        messages = list(source.receive(threading.Event()))
+        assert [message.href for message in messages] == ["a.tif", "b.tif"]
+
+        source.ack(messages[0])
+        source.fail(messages[1])
+        assert os.listdir(source.processing) == []
+        assert os.listdir(source.failed) == ["2"]
+        assert os.path.exists(os.path.join(tmp_dir, ".3"))
+
+
+def test_stream_source_stops_while_waiting() -> None:
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(read_fd) as stream, os.fdopen(write_fd, "w") as writer:
+        writer.write("a.tif\n")
+        writer.flush()
+        stop = threading.Event()
+        source = worker.StreamSource(stream, poll_interval=0.01)
+        messages = source.receive(stop)
+        assert next(messages).href == "a.tif"
+        writer.write("b.tif\n")
+        writer.flush()
+        while source._lines.empty():
+            time.sleep(0.01)
+        stop.set()
+        # The line read before stopping is not dropped, and no input is awaited
+        assert [message.href for message in messages] == ["b.tif"]
+
+
+def test_worker_metrics_window() -> None:
+    metrics = worker.WorkerMetrics(window=2)
+    for latency in [3.0, 1.0, 2.0]:
+        metrics.record(latency)
+    summary = metrics.summary()
+    assert summary["created"] == 3
+    assert summary["max"] == 2.0
+    assert len(metrics.latencies) == 2
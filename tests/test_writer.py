@@ -0,0 +1,55 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+from typing import Any, Dict
+
+from pystac import CatalogType
+
+from stactools.hls import stac, writer
+from tests import create_granule
+
+
+def read_tree(directory: str) -> Dict[str, Any]:
+    tree = {}
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            with open(path) as f:
+                text = f.read().replace(directory, "<root>")
+            tree[os.path.relpath(path, directory)] = json.loads(text)
+    return tree
+
+
+def test_save_catalog() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        collection = stac.create_collection()
+        for granule_id in [
+            "HLS.L30.T19LDD.2022165T144027.v2.0",
+            "HLS.S30.T19LDD.2022166T144741.v2.0",
+        ]:
+            item = stac.create_item(create_granule(tmp_dir, granule_id))
+            collection.add_item(item)
+
+        for catalog_type in CatalogType:
+            expected_dir = os.path.join(tmp_dir, f"expected-{catalog_type}")
+            collection.normalize_hrefs(expected_dir)
+            collection.catalog_type = catalog_type
+            collection.save()
+
+            outdir = os.path.join(tmp_dir, f"out-{catalog_type}")
+            collection.normalize_hrefs(outdir)
+            assert writer.save_catalog(collection, max_workers=4) == 3
+
+            assert read_tree(outdir) == read_tree(expected_dir)
+            for _, _, filenames in os.walk(outdir):
+                assert not any(filename.startswith(".") for filename in filenames)
+
+
+def test_write_json_file_mode() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "item.json")
+        writer.write_json(path, b"{}")
+        with open(os.path.join(tmp_dir, "expected.json"), "w"):
+            pass
+        expected = os.stat(os.path.join(tmp_dir, "expected.json")).st_mode
+        assert os.stat(path).st_mode == expected